@@ -24,6 +24,36 @@ class DependencyResult(TypedDict):
     missing_dependencies: dict[int, list[int]]  # feature_id -> [missing_ids]
 
 
+def build_feature_map(features: list[dict]) -> dict[int, dict]:
+    """Index features by id for O(1) lookups.
+
+    Build this once and pass it to helpers that accept a feature_map when
+    calling them in a loop over the same feature list.
+
+    Args:
+        features: List of feature dicts with an id field
+
+    Returns:
+        Dict mapping feature_id -> feature dict
+    """
+    return {f["id"]: f for f in features}
+
+
+def get_passing_ids(features: list[dict]) -> frozenset[int]:
+    """Collect the IDs of passing features in one pass.
+
+    The result is suitable for the passing_ids argument of
+    are_dependencies_satisfied() and get_blocking_dependencies().
+
+    Args:
+        features: List of feature dicts with id and passes fields
+
+    Returns:
+        Frozen set of feature IDs with passes=True
+    """
+    return frozenset(f["id"] for f in features if f.get("passes"))
+
+
 def resolve_dependencies(features: list[dict]) -> DependencyResult:
     """Topological sort using Kahn's algorithm with priority-aware ordering.
 
@@ -37,7 +67,7 @@ def resolve_dependencies(features: list[dict]) -> DependencyResult:
         DependencyResult with ordered_features, circular_dependencies,
         blocked_features, and missing_dependencies
     """
-    feature_map = {f["id"]: f for f in features}
+    feature_map = build_feature_map(features)
     in_degree = {f["id"]: 0 for f in features}
     adjacency: dict[int, list[int]] = {f["id"]: [] for f in features}
     blocked: dict[int, list[int]] = {}
@@ -94,10 +124,15 @@ def resolve_dependencies(features: list[dict]) -> DependencyResult:
     }
 
 
+def _has_blocker(feature: dict, passing_ids: set[int] | frozenset[int]) -> bool:
+    """Return True at the first dependency that is not passing."""
+    return any(dep_id not in passing_ids for dep_id in feature.get("dependencies") or ())
+
+
 def are_dependencies_satisfied(
     feature: dict,
     all_features: list[dict],
-    passing_ids: set[int] | None = None,
+    passing_ids: set[int] | frozenset[int] | None = None,
 ) -> bool:
     """Check if all dependencies have passes=True.
 
@@ -111,18 +146,17 @@ def are_dependencies_satisfied(
     Returns:
         True if all dependencies are satisfied (or no dependencies)
     """
-    deps = feature.get("dependencies") or []
-    if not deps:
+    if not feature.get("dependencies"):
         return True
     if passing_ids is None:
-        passing_ids = {f["id"] for f in all_features if f.get("passes")}
-    return all(dep_id in passing_ids for dep_id in deps)
+        passing_ids = get_passing_ids(all_features)
+    return not _has_blocker(feature, passing_ids)
 
 
 def get_blocking_dependencies(
     feature: dict,
     all_features: list[dict],
-    passing_ids: set[int] | None = None,
+    passing_ids: set[int] | frozenset[int] | None = None,
 ) -> list[int]:
     """Get list of incomplete dependency IDs.
 
@@ -138,21 +172,28 @@ def get_blocking_dependencies(
     """
     deps = feature.get("dependencies") or []
     if passing_ids is None:
-        passing_ids = {f["id"] for f in all_features if f.get("passes")}
+        passing_ids = get_passing_ids(all_features)
     return [dep_id for dep_id in deps if dep_id not in passing_ids]
 
 
 def would_create_circular_dependency(
-    features: list[dict], source_id: int, target_id: int
+    features: list[dict],
+    source_id: int,
+    target_id: int,
+    feature_map: dict[int, dict] | None = None,
 ) -> bool:
     """Check if adding a dependency from target to source would create a cycle.
 
-    Uses DFS with visited set for efficient cycle detection.
+    Uses an iterative BFS with a visited set, so deep chains cannot overflow
+    the stack.
 
     Args:
         features: List of all feature dicts
         source_id: The feature that would gain the dependency
         target_id: The feature that would become a dependency
+        feature_map: Optional pre-computed map from build_feature_map(features).
+            If None, will be built from features. Pass this when checking
+            several candidate dependencies against the same feature list.
 
     Returns:
         True if adding the dependency would create a cycle
@@ -160,7 +201,8 @@ def would_create_circular_dependency(
     if source_id == target_id:
         return True  # Self-reference is a cycle
 
-    feature_map = {f["id"]: f for f in features}
+    if feature_map is None:
+        feature_map = build_feature_map(features)
     source = feature_map.get(source_id)
     if not source:
         return False
@@ -170,30 +212,27 @@ def would_create_circular_dependency(
     if not target:
         return False
 
-    # DFS from target to see if we can reach source
-    visited: set[int] = set()
-
-    def can_reach(current_id: int, depth: int = 0) -> bool:
-        # Security: Prevent stack overflow with depth limit
+    # BFS from target along dependency edges to see if we can reach source
+    visited: set[int] = {target_id}
+    queue: deque[tuple[int, int]] = deque([(target_id, 0)])
+    while queue:
+        current_id, depth = queue.popleft()
+        # Security: Bound the walk on pathological graphs
         if depth > MAX_DEPENDENCY_DEPTH:
             return True  # Assume cycle if too deep (fail-safe)
-        if current_id == source_id:
-            return True
-        if current_id in visited:
-            return False
-        visited.add(current_id)
 
         current = feature_map.get(current_id)
         if not current:
-            return False
+            continue
 
-        deps = current.get("dependencies") or []
-        for dep_id in deps:
-            if can_reach(dep_id, depth + 1):
+        for dep_id in current.get("dependencies") or []:
+            if dep_id == source_id:
                 return True
-        return False
+            if dep_id not in visited:
+                visited.add(dep_id)
+                queue.append((dep_id, depth + 1))
 
-    return can_reach(target_id)
+    return False
 
 
 def validate_dependencies(
@@ -271,6 +310,112 @@ def _detect_cycles(features: list[dict], feature_map: dict) -> list[list[int]]:
     return cycles
 
 
+def _strongly_connected_components(successors: list[list[int]]) -> list[list[int]]:
+    """Find strongly connected components with an iterative Tarjan's algorithm.
+
+    Uses an explicit work stack instead of recursion, so long dependency
+    chains cannot hit Python's recursion limit.
+
+    Args:
+        successors: Adjacency lists over dense node indices 0..n-1, where
+            successors[i] holds the indices node i points to.
+
+    Returns:
+        List of SCCs (lists of node indices) in reverse topological order: an
+        SCC is emitted only after every SCC reachable from it.
+    """
+    node_count = len(successors)
+    index = [-1] * node_count
+    lowlink = [0] * node_count
+    on_stack = [False] * node_count
+    stack: list[int] = []
+    sccs: list[list[int]] = []
+    counter = 0
+
+    for root in range(node_count):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(successors[root]))]
+
+        while work:
+            node, pending = work[-1]
+            descended = False
+            for succ in pending:
+                if index[succ] == -1:
+                    index[succ] = lowlink[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = True
+                    work.append((succ, iter(successors[succ])))
+                    descended = True
+                    break
+                if on_stack[succ]:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            if descended:
+                continue
+
+            # All successors done: propagate lowlink and pop a finished SCC
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                scc: list[int] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    scc.append(member)
+                    if member == node:
+                        break
+                sccs.append(scc)
+
+    return sccs
+
+
+def _downstream_counts(children: list[list[int]]) -> list[int]:
+    """Count the distinct nodes reachable from each node, excluding itself.
+
+    Works on the condensed graph, where Tarjan emits SCCs leaves-first so
+    every child SCC is finished before its parents. Each SCC's reach is a
+    Python int used as a bitset (one bit per node), built by OR-ing its own
+    members with its children's reaches. Members of a cycle share one reach
+    and count each other as downstream.
+
+    Counts are distinct: a node reachable along several paths (the shared
+    bottom of a diamond) is counted once, where the previous additive sum
+    counted it once per path.
+
+    Cost is O(V * (V+E) / w) time for word size w and O(V^2) bits of memory,
+    which is fine for feature graphs of up to tens of thousands of features.
+
+    Args:
+        children: Adjacency lists over dense node indices 0..n-1.
+
+    Returns:
+        List where entry i is the downstream count of node i.
+    """
+    sccs = _strongly_connected_components(children)
+    scc_of = [0] * len(children)
+    for scc_index, scc in enumerate(sccs):
+        for node in scc:
+            scc_of[node] = scc_index
+
+    reach = [0] * len(sccs)
+    for scc_index, scc in enumerate(sccs):
+        scc_reach = 0
+        for node in scc:
+            scc_reach |= 1 << node
+            for child in children[node]:
+                scc_reach |= reach[scc_of[child]]
+        reach[scc_index] = scc_reach
+
+    return [reach[scc_of[node]].bit_count() - 1 for node in range(len(children))]
+
+
 def compute_scheduling_scores(features: list[dict]) -> dict[int, float]:
     """Compute scheduling scores for all features.
 
@@ -281,6 +426,10 @@ def compute_scheduling_scores(features: list[dict]) -> dict[int, float]:
 
     Score formula: (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
 
+    Unblocking potential counts each distinct downstream feature once, so a
+    feature reached through both sides of a diamond adds 1, not 2; see
+    _downstream_counts() for the cost.
+
     Args:
         features: List of feature dicts with id, priority, dependencies fields
 
@@ -290,64 +439,61 @@ def compute_scheduling_scores(features: list[dict]) -> dict[int, float]:
     if not features:
         return {}
 
-    # Build adjacency lists
-    children: dict[int, list[int]] = {f["id"]: [] for f in features}  # who depends on me
-    parents: dict[int, list[int]] = {f["id"]: [] for f in features}   # who I depend on
+    # Unpack the dicts once into parallel lists indexed by position, so the
+    # graph passes below work on small ints instead of dict lookups
+    node_count = len(features)
+    ids = [f["id"] for f in features]
+    priorities = [f.get("priority", 999) for f in features]
+    position = {fid: i for i, fid in enumerate(ids)}
 
-    for f in features:
+    # Build adjacency lists
+    children: list[list[int]] = [[] for _ in range(node_count)]  # who depends on me
+    parent_count = [0] * node_count  # how many valid deps I have
+    for i, f in enumerate(features):
         for dep_id in (f.get("dependencies") or []):
-            if dep_id in children:  # Only valid deps
-                children[dep_id].append(f["id"])
-                parents[f["id"]].append(dep_id)
+            dep_index = position.get(dep_id)
+            if dep_index is not None:  # Only valid deps
+                children[dep_index].append(i)
+                parent_count[i] += 1
 
     # Calculate depths via BFS from roots
-    # Use visited set to prevent infinite loops from circular dependencies
+    # A node is settled the first time it is popped, which handles cycles
     # Use deque for O(1) popleft instead of list.pop(0) which is O(n)
-    depths: dict[int, int] = {}
-    visited: set[int] = set()
-    roots = [f["id"] for f in features if not parents[f["id"]]]
-    bfs_queue: deque[tuple[int, int]] = deque((root, 0) for root in roots)
+    depths = [-1] * node_count
+    bfs_queue: deque[tuple[int, int]] = deque(
+        (i, 0) for i in range(node_count) if not parent_count[i]
+    )
     while bfs_queue:
-        node_id, depth = bfs_queue.popleft()
-        if node_id in visited:
+        node, depth = bfs_queue.popleft()
+        if depths[node] != -1:
             continue  # Skip already visited nodes (handles cycles)
-        visited.add(node_id)
-        depths[node_id] = depth
-        for child_id in children[node_id]:
-            if child_id not in visited:
-                bfs_queue.append((child_id, depth + 1))
+        depths[node] = depth
+        for child in children[node]:
+            if depths[child] == -1:
+                bfs_queue.append((child, depth + 1))
 
-    # Handle orphaned nodes (shouldn't happen but be safe)
-    for f in features:
-        if f["id"] not in depths:
-            depths[f["id"]] = 0
+    # Handle orphaned nodes (only reachable through a cycle)
+    depths = [d if d != -1 else 0 for d in depths]
 
-    # Calculate transitive downstream counts (reverse topo order)
-    downstream: dict[int, int] = {f["id"]: 0 for f in features}
-    # Process in reverse depth order (leaves first)
-    for fid in sorted(depths.keys(), key=lambda x: -depths[x]):
-        for parent_id in parents[fid]:
-            downstream[parent_id] += 1 + downstream[fid]
+    # Calculate transitive downstream counts
+    downstream = _downstream_counts(children)
 
     # Normalize and compute scores
-    max_depth = max(depths.values()) if depths else 0
-    max_downstream = max(downstream.values()) if downstream else 0
+    max_depth = max(depths)
+    max_downstream = max(downstream)
 
     scores: dict[int, float] = {}
-    for f in features:
-        fid = f["id"]
-
+    for i in range(node_count):
         # Unblocking score: 0-1, higher = unblocks more
-        unblock = downstream[fid] / max_downstream if max_downstream > 0 else 0
+        unblock = downstream[i] / max_downstream if max_downstream > 0 else 0
 
         # Depth score: 0-1, higher = closer to root (no deps)
-        depth_score = 1 - (depths[fid] / max_depth) if max_depth > 0 else 1
+        depth_score = 1 - (depths[i] / max_depth) if max_depth > 0 else 1
 
         # Priority factor: 0-1, lower priority number = higher factor
-        priority = f.get("priority", 999)
-        priority_factor = (10 - min(priority, 10)) / 10
+        priority_factor = (10 - min(priorities[i], 10)) / 10
 
-        scores[fid] = (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
+        scores[ids[i]] = (1000 * unblock) + (100 * depth_score) + (10 * priority_factor)
 
     return scores
 
@@ -367,16 +513,19 @@ def get_ready_features(features: list[dict], limit: int = 10) -> list[dict]:
     Returns:
         List of ready features, sorted by priority
     """
-    passing_ids = {f["id"] for f in features if f.get("passes")}
+    passing_ids = get_passing_ids(features)
 
     ready = []
     for f in features:
         if f.get("passes") or f.get("in_progress"):
             continue
-        deps = f.get("dependencies") or []
-        if all(dep_id in passing_ids for dep_id in deps):
+        if not _has_blocker(f, passing_ids):
             ready.append(f)
 
+    # Nothing to rank - skip the whole-graph scoring pass
+    if not ready:
+        return []
+
     # Sort by scheduling score (higher = first), then priority, then id
     scores = compute_scheduling_scores(features)
     ready.sort(key=lambda f: (-scores.get(f["id"], 0), f.get("priority", 999), f["id"]))
@@ -393,7 +542,7 @@ def get_blocked_features(features: list[dict]) -> list[dict]:
     Returns:
         List of blocked features with 'blocked_by' field added
     """
-    passing_ids = {f["id"] for f in features if f.get("passes")}
+    passing_ids = get_passing_ids(features)
 
     blocked = []
     for f in features:
@@ -416,18 +565,17 @@ def build_graph_data(features: list[dict]) -> dict:
     Returns:
         Dict with 'nodes' and 'edges' for graph visualization
     """
-    passing_ids = {f["id"] for f in features if f.get("passes")}
+    passing_ids = get_passing_ids(features)
 
     nodes = []
     edges = []
 
     for f in features:
         deps = f.get("dependencies") or []
-        blocking = [d for d in deps if d not in passing_ids]
 
         if f.get("passes"):
             status = "done"
-        elif blocking:
+        elif _has_blocker(f, passing_ids):
             status = "blocked"
         elif f.get("in_progress"):
             status = "in_progress"
@@ -220,6 +220,7 @@ async def run_autonomous_agent(
     # Main loop
     iteration = 0
     rate_limit_retries = 0  # Track consecutive rate limit errors for exponential backoff
+    rate_limit_backoff: Optional[int] = None  # Last backoff delay, seeds decorrelated jitter
     error_retries = 0  # Track consecutive non-rate-limit errors
 
     while True:
@@ -312,7 +313,8 @@ async def run_autonomous_agent(
                     delay_seconds = clamp_retry_delay(retry_seconds)
                 else:
                     # Use exponential backoff when retry-after unknown
-                    delay_seconds = calculate_rate_limit_backoff(rate_limit_retries)
+                    delay_seconds = calculate_rate_limit_backoff(rate_limit_retries, rate_limit_backoff)
+                    rate_limit_backoff = delay_seconds
                     rate_limit_retries += 1
 
                 # Try to parse reset time from response (more specific format)
@@ -391,6 +393,7 @@ async def run_autonomous_agent(
             # Reset rate limit retries only if no rate limit signal was detected
             if reset_rate_limit_retries:
                 rate_limit_retries = 0
+                rate_limit_backoff = None
 
             await asyncio.sleep(delay_seconds)
 
@@ -406,7 +409,8 @@ async def run_autonomous_agent(
                     response = "unknown"
             if response == "unknown":
                 # Use exponential backoff when retry-after unknown or malformed
-                delay_seconds = calculate_rate_limit_backoff(rate_limit_retries)
+                delay_seconds = calculate_rate_limit_backoff(rate_limit_retries, rate_limit_backoff)
+                rate_limit_backoff = delay_seconds
                 rate_limit_retries += 1
                 print(f"\nRate limit hit. Backoff wait: {delay_seconds} seconds (attempt #{rate_limit_retries})...")
             else:
@@ -418,6 +422,7 @@ async def run_autonomous_agent(
             # Non-rate-limit errors: linear backoff capped at 5 minutes
             # Reset rate limit counter so mixed events don't inflate delays
             rate_limit_retries = 0
+            rate_limit_backoff = None
             error_retries += 1
             delay_seconds = calculate_error_backoff(error_retries)
             print("\nSession encountered an error")
@@ -43,6 +43,12 @@ EXTRA_READ_PATHS_VAR = "EXTRA_READ_PATHS"
 # this blocklist and the filesystem browser API share a single source of truth.
 EXTRA_READ_PATHS_BLOCKLIST = SENSITIVE_DIRECTORIES
 
+# Pattern: claude-{name}-{version}-{date} -> claude-{name}-{version}@{date}
+# Example: claude-opus-4-5-20251101 -> claude-opus-4-5@20251101
+# The date is always 8 digits at the end
+_VERTEX_MODEL_PATTERN = re.compile(r"^(claude-.+)-(\d{8})$")
+
+
 def convert_model_for_vertex(model: str) -> str:
     """
     Convert model name format for Vertex AI compatibility.
@@ -61,10 +67,7 @@ def convert_model_for_vertex(model: str) -> str:
     if os.getenv("CLAUDE_CODE_USE_VERTEX") != "1":
         return model
 
-    # Pattern: claude-{name}-{version}-{date} -> claude-{name}-{version}@{date}
-    # Example: claude-opus-4-5-20251101 -> claude-opus-4-5@20251101
-    # The date is always 8 digits at the end
-    match = re.match(r'^(claude-.+)-(\d{8})$', model)
+    match = _VERTEX_MODEL_PATTERN.match(model)
     if match:
         base_name, date = match.groups()
         return f"{base_name}@{date}"
@@ -122,18 +125,24 @@ def get_extra_read_paths() -> list[Path]:
     Returns:
         List of validated, canonicalized Path objects.
     """
+    # Bail out before touching the filesystem when there is nothing to check
+    # (unset, empty, or only separators/whitespace)
     raw_value = os.getenv(EXTRA_READ_PATHS_VAR, "").strip()
     if not raw_value:
         return []
+    path_strs = [p.strip() for p in raw_value.split(",") if p.strip()]
+    if not path_strs:
+        return []
 
     validated_paths: list[Path] = []
-    home_dir = Path.home()
 
-    for path_str in raw_value.split(","):
-        path_str = path_str.strip()
-        if not path_str:
-            continue
+    # Resolve each sensitive root once per call rather than once per candidate
+    home_dir = Path.home()
+    sensitive_roots: dict[Path, str] = {
+        (home_dir / sensitive).resolve(): sensitive for sensitive in EXTRA_READ_PATHS_BLOCKLIST
+    }
 
+    for path_str in path_strs:
         # Parse and canonicalize the path
         try:
             path = Path(path_str).resolve()
@@ -156,26 +165,18 @@ def get_extra_read_paths() -> list[Path]:
             print(f"   - Warning: EXTRA_READ_PATHS path is not a directory, skipping: {path_str}")
             continue
 
-        # Check against sensitive directory blocklist
-        is_blocked = False
-        for sensitive in EXTRA_READ_PATHS_BLOCKLIST:
-            sensitive_path = (home_dir / sensitive).resolve()
-            try:
-                # Block if path IS the sensitive dir or is INSIDE it
-                if path == sensitive_path or path.is_relative_to(sensitive_path):
-                    print(f"   - Warning: EXTRA_READ_PATHS blocked sensitive path: {path_str}")
-                    is_blocked = True
-                    break
-                # Also block if sensitive dir is INSIDE the requested path
-                if sensitive_path.is_relative_to(path):
-                    print(f"   - Warning: EXTRA_READ_PATHS path contains sensitive directory ({sensitive}): {path_str}")
-                    is_blocked = True
-                    break
-            except (OSError, ValueError):
-                # is_relative_to can raise on some edge cases
-                continue
-
-        if is_blocked:
+        # Block if path IS a sensitive dir or is INSIDE one (set lookups)
+        if path in sensitive_roots or not sensitive_roots.keys().isdisjoint(path.parents):
+            print(f"   - Warning: EXTRA_READ_PATHS blocked sensitive path: {path_str}")
+            continue
+
+        # Also block if a sensitive dir is INSIDE the requested path
+        contained = next(
+            (name for root, name in sensitive_roots.items() if root.is_relative_to(path)),
+            None,
+        )
+        if contained is not None:
+            print(f"   - Warning: EXTRA_READ_PATHS path contains sensitive directory ({contained}): {path_str}")
             continue
 
         validated_paths.append(path)
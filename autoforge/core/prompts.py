@@ -9,6 +9,7 @@ Fallback chain:
 2. Base template: .claude/templates/{name}.template.md
 """
 
+import functools
 import re
 import shutil
 from pathlib import Path
@@ -23,6 +24,25 @@ def get_project_prompts_dir(project_dir: Path) -> Path:
     return get_prompts_dir(project_dir)
 
 
+@functools.lru_cache(maxsize=32)
+def _read_prompt_file(path: Path, mtime_ns: int, size: int) -> str:
+    """Read a prompt file, memoized on (path, mtime, size) so edits are picked up.
+
+    Size is part of the key because filesystems with coarse timestamps can
+    leave mtime unchanged across an edit made within the same tick.
+    """
+    return path.read_text(encoding="utf-8")
+
+
+def _load_prompt_file(path: Path) -> str | None:
+    """Return the cached contents of path, or None if it does not exist."""
+    try:
+        file_stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return _read_prompt_file(path, file_stat.st_mtime_ns, file_stat.st_size)
+
+
 def load_prompt(name: str, project_dir: Path | None = None) -> str:
     """
     Load a prompt template with fallback chain.
@@ -45,19 +65,21 @@ def load_prompt(name: str, project_dir: Path | None = None) -> str:
     if project_dir:
         project_prompts = get_project_prompts_dir(project_dir)
         project_path = project_prompts / f"{name}.md"
-        if project_path.exists():
-            try:
-                return project_path.read_text(encoding="utf-8")
-            except (OSError, PermissionError) as e:
-                print(f"Warning: Could not read {project_path}: {e}")
+        try:
+            content = _load_prompt_file(project_path)
+            if content is not None:
+                return content
+        except (OSError, PermissionError) as e:
+            print(f"Warning: Could not read {project_path}: {e}")
 
     # 2. Try base template
     template_path = TEMPLATES_DIR / f"{name}.template.md"
-    if template_path.exists():
-        try:
-            return template_path.read_text(encoding="utf-8")
-        except (OSError, PermissionError) as e:
-            print(f"Warning: Could not read {template_path}: {e}")
+    try:
+        content = _load_prompt_file(template_path)
+        if content is not None:
+            return content
+    except (OSError, PermissionError) as e:
+        print(f"Warning: Could not read {template_path}: {e}")
 
     raise FileNotFoundError(
         f"Prompt '{name}' not found in:\n"
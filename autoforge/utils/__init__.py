@@ -6,6 +6,7 @@ from autoforge.utils.rate_limit import (
     calculate_rate_limit_backoff,
     clamp_retry_delay,
     is_rate_limit_error,
+    is_rate_limit_error_batch,
     parse_retry_after,
 )
 
@@ -15,6 +16,7 @@ __all__ = [
     "calculate_rate_limit_backoff",
     "clamp_retry_delay",
     "is_rate_limit_error",
+    "is_rate_limit_error_batch",
     "parse_retry_after",
 ]
 
@@ -6,8 +6,10 @@ Shared utilities for detecting and handling API rate limits.
 Used by both agent.py (production) and test_rate_limit_utils.py (tests).
 """
 
+import functools
 import random
 import re
+from collections.abc import Iterable
 from typing import Optional
 
 # Regex patterns for rate limit detection (used in both exception messages and response text)
@@ -15,19 +17,45 @@ from typing import Optional
 RATE_LIMIT_REGEX_PATTERNS = [
     r"\brate[_\s]?limit",         # "rate limit", "rate_limit", "ratelimit"
     r"\btoo\s+many\s+requests",   # "too many requests"
-    r"\bhttp\s*429\b",            # "http 429", "http429"
-    r"\bstatus\s*429\b",          # "status 429", "status429"
-    r"\berror\s*429\b",           # "error 429", "error429"
+    r"\b(?:http|status|error)\s*429\b",  # "http 429", "status429", "error 429"
     r"\b429\s+too\s+many",        # "429 too many"
     r"\b(?:server|api|system)\s+(?:is\s+)?overloaded\b",  # "server is overloaded", "api overloaded"
     r"\bquota\s*exceeded\b",      # "quota exceeded"
 ]
 
-# Compiled regex for efficient matching
-_RATE_LIMIT_REGEX = re.compile(
-    "|".join(RATE_LIMIT_REGEX_PATTERNS),
-    re.IGNORECASE
-)
+# Compiled once into a single alternation so each message is scanned in one
+# pass; all groups are non-capturing since only a yes/no answer is needed.
+# Patterns are all lowercase and callers lowercase the message first, which
+# is cheaper than having sre case-fold every character under re.IGNORECASE.
+_RATE_LIMIT_REGEX = re.compile("|".join(RATE_LIMIT_REGEX_PATTERNS))
+
+# Literal substrings, at least one of which every pattern above requires.
+# Messages containing none of them cannot match, so the regex is skipped.
+_RATE_LIMIT_HINTS = ("rate", "429", "quota", "overload", "requests")
+
+# Retry-after patterns, tried in order (first match wins)
+# Patterns require explicit "seconds" or "s" unit, OR no unit at all (end of string/sentence)
+# This prevents matching "30 minutes" or "1 hour" since those have non-seconds units
+RETRY_AFTER_REGEX_PATTERNS = [
+    r"retry.?after[:\s]+(\d+)\s*(?:seconds?|s\b)",  # Requires seconds unit
+    r"retry.?after[:\s]+(\d+)(?:\s*$|\s*[,.])",     # Or end of string/sentence
+    r"try again in\s+(\d+)\s*(?:seconds?|s\b)",     # Requires seconds unit
+    r"try again in\s+(\d+)(?:\s*$|\s*[,.])",        # Or end of string/sentence
+    r"(\d+)\s*seconds?\s*(?:remaining|left|until)",
+]
+
+# Compiled once at import (case-sensitive, matched against the lowercased
+# message like _RATE_LIMIT_REGEX). Kept as separate patterns rather than one
+# alternation so an explicit retry-after hint outranks an earlier
+# "N seconds left" phrase elsewhere in the text.
+_RETRY_AFTER_REGEXES = tuple(re.compile(pattern) for pattern in RETRY_AFTER_REGEX_PATTERNS)
+
+# Short error strings (exception messages, header values) repeat across
+# retries, so those are memoized. Longer inputs - whole session responses -
+# are effectively unique and are never cached, which keeps the caches from
+# holding on to transcripts.
+_MEMO_MAX_LENGTH = 512
+_MEMO_CACHE_SIZE = 1024
 
 
 def parse_retry_after(error_message: str) -> Optional[int]:
@@ -46,24 +74,31 @@ def parse_retry_after(error_message: str) -> Optional[int]:
     Returns:
         Seconds to wait, or None if not parseable.
     """
-    # Patterns require explicit "seconds" or "s" unit, OR no unit at all (end of string/sentence)
-    # This prevents matching "30 minutes" or "1 hour" since those have non-seconds units
-    patterns = [
-        r"retry.?after[:\s]+(\d+)\s*(?:seconds?|s\b)",  # Requires seconds unit
-        r"retry.?after[:\s]+(\d+)(?:\s*$|\s*[,.])",     # Or end of string/sentence
-        r"try again in\s+(\d+)\s*(?:seconds?|s\b)",     # Requires seconds unit
-        r"try again in\s+(\d+)(?:\s*$|\s*[,.])",        # Or end of string/sentence
-        r"(\d+)\s*seconds?\s*(?:remaining|left|until)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, error_message, re.IGNORECASE)
+    if len(error_message) <= _MEMO_MAX_LENGTH:
+        return _parse_retry_after_memo(error_message)
+    return _parse_retry_after(error_message)
+
+
+def _parse_retry_after(error_message: str) -> Optional[int]:
+    """Uncached retry-after parse behind parse_retry_after()."""
+    # Fast path for a bare "Retry-After: N" header value
+    if error_message[:12].lower() == "retry-after:":
+        value = error_message[12:].strip()
+        if value.isdecimal():
+            return int(value)
+
+    message = error_message.lower()
+    for regex in _RETRY_AFTER_REGEXES:
+        match = regex.search(message)
         if match:
             return int(match.group(1))
 
     return None
 
 
+_parse_retry_after_memo = functools.lru_cache(maxsize=_MEMO_CACHE_SIZE)(_parse_retry_after)
+
+
 def is_rate_limit_error(error_message: str) -> bool:
     """
     Detect if an error message indicates a rate limit.
@@ -77,16 +112,57 @@ def is_rate_limit_error(error_message: str) -> bool:
     Returns:
         True if the message indicates a rate limit, False otherwise.
     """
-    return bool(_RATE_LIMIT_REGEX.search(error_message))
+    if len(error_message) <= _MEMO_MAX_LENGTH:
+        return _matches_rate_limit_memo(error_message)
+    return _matches_rate_limit(error_message)
 
 
-def calculate_rate_limit_backoff(retries: int) -> int:
+def is_rate_limit_error_batch(error_messages: Iterable[str]) -> list[bool]:
+    """
+    Detect rate limits across many messages, e.g. when scanning a log.
+
+    Equivalent to calling is_rate_limit_error() on each message, but
+    bypasses its memo cache so a bulk scan of mostly-unique lines doesn't
+    evict the messages the agent loop is retrying on.
+
+    Args:
+        error_messages: The error messages to check
+
+    Returns:
+        One flag per message, in input order.
+    """
+    return [_matches_rate_limit(message) for message in error_messages]
+
+
+def _matches_rate_limit(error_message: str) -> bool:
+    """Uncached rate-limit check shared by the scalar and batch APIs."""
+    message = error_message.lower()
+    if not any(hint in message for hint in _RATE_LIMIT_HINTS):
+        return False
+    return bool(_RATE_LIMIT_REGEX.search(message))
+
+
+_matches_rate_limit_memo = functools.lru_cache(maxsize=_MEMO_CACHE_SIZE)(_matches_rate_limit)
+
+
+# min(15 * 2^retries, 3600) for retries 0..8; the ladder is flat from 8 on
+_RATE_LIMIT_BACKOFF_BASE = (15, 30, 60, 120, 240, 480, 960, 1920, 3600)
+
+
+def calculate_rate_limit_backoff(retries: int, prev_delay: Optional[int] = None) -> int:
     """
     Calculate exponential backoff with jitter for rate limits.
 
-    Base formula: min(15 * 2^retries, 3600)
-    Jitter: adds 0-30% random jitter to prevent thundering herd.
-    Base sequence: ~15-20s, ~30-40s, ~60-78s, ~120-156s, ...
+    Base formula: min(15 * 2^retries, 3600), a floor every wait respects.
+    Base sequence: ~15-20s, ~30-57s, ~60-171s, ~120-513s, ...
+
+    First wait (no prev_delay): the base plus 0-30% jitter.
+
+    Later waits (prev_delay given) use decorrelated jitter floored at the
+    base: random between the base and 3 * prev_delay (capped at 3600). Each
+    agent's spread then depends on its own previous draw rather than only
+    the shared retry count, while the streak never drops back below the
+    exponential ladder.
 
     The lower starting delay (15s vs 60s) allows faster recovery from
     transient rate limits, while jitter prevents synchronized retries
@@ -94,13 +170,22 @@ def calculate_rate_limit_backoff(retries: int) -> int:
 
     Args:
         retries: Number of consecutive rate limit retries (0-indexed)
+        prev_delay: The previous backoff delay in this retry streak, if any
 
     Returns:
-        Delay in seconds (clamped to 1-3600 range, with jitter)
+        Delay in seconds, at least the base for this retry count
     """
-    base = int(min(max(15 * (2 ** retries), 1), 3600))
-    jitter = random.uniform(0, base * 0.3)
-    return int(base + jitter)
+    base = _RATE_LIMIT_BACKOFF_BASE[min(max(retries, 0), len(_RATE_LIMIT_BACKOFF_BASE) - 1)]
+    if prev_delay is None:
+        jitter = random.random() * base * 0.3
+        return int(base + jitter)
+
+    ceiling = max(min(prev_delay * 3, 3600), base)
+    return int(base + random.random() * (ceiling - base))
+
+
+# min(max(30 * retries, 1), 300) for retries 0..10; the ramp is flat from 10 on
+_ERROR_BACKOFF = (1, 30, 60, 90, 120, 150, 180, 210, 240, 270, 300)
 
 
 def calculate_error_backoff(retries: int) -> int:
@@ -116,7 +201,7 @@ def calculate_error_backoff(retries: int) -> int:
     Returns:
         Delay in seconds (clamped to 1-300 range)
     """
-    return min(max(30 * retries, 1), 300)
+    return _ERROR_BACKOFF[min(max(retries, 0), len(_ERROR_BACKOFF) - 1)]
 
 
 def clamp_retry_delay(delay_seconds: int) -> int:
@@ -129,4 +214,8 @@ def clamp_retry_delay(delay_seconds: int) -> int:
     Returns:
         Delay clamped to 1-3600 seconds
     """
-    return min(max(delay_seconds, 1), 3600)
+    if delay_seconds < 1:
+        return 1
+    if delay_seconds > 3600:
+        return 3600
+    return delay_seconds
@@ -44,6 +44,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from api.database import Feature, atomic_transaction, create_database
 from api.dependency_resolver import (
     MAX_DEPENDENCIES_PER_FEATURE,
+    build_feature_map,
     compute_scheduling_scores,
     would_create_circular_dependency,
 )
@@ -1051,8 +1052,9 @@ def feature_set_dependencies(
                 else:
                     test_features.append(f)
 
+            test_feature_map = build_feature_map(test_features)
             for dep_id in dependency_ids:
-                if would_create_circular_dependency(test_features, feature_id, dep_id):
+                if would_create_circular_dependency(test_features, feature_id, dep_id, test_feature_map):
                     return json.dumps({"error": f"Cannot add dependency {dep_id}: would create circular dependency"})
 
             # Set dependencies atomically
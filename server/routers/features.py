@@ -832,8 +832,12 @@ def _get_dependency_resolver():
     root = Path(__file__).parent.parent.parent
     if str(root) not in sys.path:
         sys.path.insert(0, str(root))
-    from api.dependency_resolver import MAX_DEPENDENCIES_PER_FEATURE, would_create_circular_dependency
-    return would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE
+    from api.dependency_resolver import (
+        MAX_DEPENDENCIES_PER_FEATURE,
+        build_feature_map,
+        would_create_circular_dependency,
+    )
+    return would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE, build_feature_map
 
 
 @router.post("/{feature_id}/dependencies/{dep_id}")
@@ -865,7 +869,7 @@ async def add_dependency(project_name: str, feature_id: str, dep_id: str):
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project directory not found")
 
-    would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE = _get_dependency_resolver()
+    would_create_circular_dependency, MAX_DEPENDENCIES_PER_FEATURE, _ = _get_dependency_resolver()
     _, Feature = _get_db_classes()
 
     try:
@@ -985,7 +989,7 @@ async def set_dependencies(project_name: str, feature_id: str, update: Dependenc
     if not project_dir.exists():
         raise HTTPException(status_code=404, detail="Project directory not found")
 
-    would_create_circular_dependency, _ = _get_dependency_resolver()
+    would_create_circular_dependency, _, build_feature_map = _get_dependency_resolver()
     _, Feature = _get_db_classes()
 
     try:
@@ -1010,9 +1014,10 @@ async def set_dependencies(project_name: str, feature_id: str, update: Dependenc
                 else:
                     test_features.append(f)
 
+            test_feature_map = build_feature_map(test_features)
             for dep_id in dependency_ids:
                 # source_id = feature_id (gaining dep), target_id = dep_id (being depended upon)
-                if would_create_circular_dependency(test_features, feature_id, dep_id):
+                if would_create_circular_dependency(test_features, feature_id, dep_id, test_feature_map):
                     raise HTTPException(
                         status_code=400,
                         detail=f"Cannot add dependency {dep_id}: would create circular dependency"
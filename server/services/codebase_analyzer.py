@@ -10,8 +10,11 @@ This module is purely additive - it does not modify any existing services.
 
 import json
 import logging
+import os
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -134,6 +137,32 @@ class CodebaseAnalysis:
     raw_package_json: dict | None = None
     raw_pyproject: dict | None = None
     
+    # Lookups by type are built on first access; the lists are not expected
+    # to change once analyze_codebase() has returned the analysis.
+    @cached_property
+    def docs_by_type(self) -> dict[str, list[DocFile]]:
+        """Documentation files grouped by doc_type."""
+        grouped: dict[str, list[DocFile]] = {}
+        for doc in self.docs:
+            grouped.setdefault(doc.doc_type, []).append(doc)
+        return grouped
+    
+    @cached_property
+    def specs_by_type(self) -> dict[str, list[SpecFile]]:
+        """Spec/planning files grouped by spec_type."""
+        grouped: dict[str, list[SpecFile]] = {}
+        for spec in self.specs:
+            grouped.setdefault(spec.spec_type, []).append(spec)
+        return grouped
+    
+    @cached_property
+    def tasks_by_ref_type(self) -> dict[str, list[TaskRef]]:
+        """Task references grouped by ref_type."""
+        grouped: dict[str, list[TaskRef]] = {}
+        for task in self.tasks:
+            grouped.setdefault(task.ref_type, []).append(task)
+        return grouped
+    
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization or MCP tool response."""
         return {
@@ -659,16 +688,47 @@ def _find_specs(project_dir: Path) -> list[SpecFile]:
     return specs
 
 
+# Task reference patterns, compiled once at import
+_TODO_PATTERN = re.compile(r"(TODO|FIXME|HACK|XXX)[\s:]+(.+)", re.IGNORECASE)
+_GITHUB_ISSUE_PATTERN = re.compile(r"#(\d+)")
+
+
+def _iter_source_files(project_dir: Path, extensions: set[str], skip_dirs: set[str]) -> Iterator[Path]:
+    """Yield files with a matching suffix, walking the tree once with os.scandir.
+
+    Files in a directory are yielded before descending into its
+    subdirectories (top-down, depth-first). ``DirEntry`` caches the file
+    type from the directory listing, so telling files from directories
+    costs no extra stat call. Being a generator, the walk stops as soon as
+    the caller stops consuming it.
+    """
+    stack = [str(project_dir)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skip_dirs:
+                    subdirs.append(entry.path)
+                continue
+            file_path = Path(entry.path)
+            if file_path.suffix in extensions:
+                yield file_path
+
+        # Reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
 def _find_tasks(project_dir: Path, max_files: int = 100) -> list[TaskRef]:
     """Find TODO/FIXME comments and issue references in source files."""
     tasks = []
     
-    # Patterns to search for
-    todo_pattern = re.compile(r"(?:TODO|FIXME|HACK|XXX)[\s:]+(.+)", re.IGNORECASE)
-    github_issue_pattern = re.compile(r"#(\d+)")
-    jira_pattern = re.compile(r"([A-Z]+-\d+)")
-    linear_pattern = re.compile(r"(ENG-\d+|[A-Z]{2,5}-\d+)")
-    
     # Extensions to scan
     scan_extensions = {".py", ".js", ".ts", ".jsx", ".tsx", ".vue", ".svelte", ".rs", ".go"}
     
@@ -676,53 +736,41 @@ def _find_tasks(project_dir: Path, max_files: int = 100) -> list[TaskRef]:
     skip_dirs = {"node_modules", ".git", "venv", ".venv", "__pycache__", "dist", "build", ".next"}
     
     files_scanned = 0
-    for root, dirs, files in project_dir.walk():
-        # Skip directories
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        
-        for filename in files:
-            if files_scanned >= max_files:
-                break
-                
-            file_path = root / filename
-            if file_path.suffix not in scan_extensions:
-                continue
-            
-            files_scanned += 1
-            rel_path = str(file_path.relative_to(project_dir))
-            
-            try:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    for line_num, line in enumerate(f, 1):
-                        # TODO/FIXME
-                        match = todo_pattern.search(line)
-                        if match:
-                            ref_type = "todo"
-                            if "FIXME" in line.upper():
-                                ref_type = "fixme"
-                            tasks.append(TaskRef(
-                                ref_type=ref_type,
-                                content=match.group(1).strip()[:200],
-                                file_path=rel_path,
-                                line_number=line_num
-                            ))
-                        
-                        # GitHub issues (only in comments)
-                        if "#" in line and ("TODO" in line.upper() or "//" in line or "#" in line[:5]):
-                            for issue_match in github_issue_pattern.finditer(line):
-                                issue_num = issue_match.group(1)
-                                if int(issue_num) < 100000:  # Reasonable issue number
-                                    tasks.append(TaskRef(
-                                        ref_type="github-issue",
-                                        content=f"#{issue_num}",
-                                        file_path=rel_path,
-                                        line_number=line_num
-                                    ))
-            except OSError:
-                pass
-        
+    for file_path in _iter_source_files(project_dir, scan_extensions, skip_dirs):
         if files_scanned >= max_files:
             break
+
+        files_scanned += 1
+        rel_path = str(file_path.relative_to(project_dir))
+        
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                for line_num, line in enumerate(f, 1):
+                    # TODO/FIXME - the matched marker decides the type, so the
+                    # line is only scanned once
+                    match = _TODO_PATTERN.search(line)
+                    if match:
+                        ref_type = "fixme" if match.group(1).upper() == "FIXME" else "todo"
+                        tasks.append(TaskRef(
+                            ref_type=ref_type,
+                            content=match.group(2).strip()[:200],
+                            file_path=rel_path,
+                            line_number=line_num
+                        ))
+                    
+                    # GitHub issues (only in comments)
+                    if "#" in line and ("TODO" in line.upper() or "//" in line or "#" in line[:5]):
+                        for issue_match in _GITHUB_ISSUE_PATTERN.finditer(line):
+                            issue_num = issue_match.group(1)
+                            if int(issue_num) < 100000:  # Reasonable issue number
+                                tasks.append(TaskRef(
+                                    ref_type="github-issue",
+                                    content=f"#{issue_num}",
+                                    file_path=rel_path,
+                                    line_number=line_num
+                                ))
+        except OSError:
+            pass
     
     return tasks
 
@@ -829,7 +877,7 @@ def analyze_codebase(project_dir: Path) -> CodebaseAnalysis:
     """
     project_dir = Path(project_dir).resolve()
     
-    if not project_dir.exists() or not project_dir.is_dir():
+    if not project_dir.is_dir():
         raise ValueError(f"Invalid project directory: {project_dir}")
     
     logger.info("Analyzing codebase at: %s", project_dir)
@@ -0,0 +1,68 @@
+"""
+Agent Loop Tests
+================
+
+Tests for the retry handling in run_autonomous_agent().
+Run with: python -m pytest tests/test_agent.py
+"""
+
+import asyncio
+
+from autoforge.core import agent
+
+
+class _FakeClient:
+    """Stands in for ClaudeSDKClient; the loop only enters and exits it."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+def _run_rate_limited_loop(monkeypatch, tmp_path, iterations: int) -> list[float]:
+    """Drive the agent loop through consecutive rate-limited sessions.
+
+    Every session reports a rate limit without a retry-after hint, so each
+    iteration takes the exponential backoff path. Returns the backoff
+    delays in order, leaving out the fixed 1s pause between sessions.
+    """
+    sleeps: list[float] = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def fake_session(client, message, project_dir):
+        return "rate_limit", "unknown"
+
+    monkeypatch.setattr(agent, "count_passing_tests", lambda project_dir: (0, 0, 1))
+    monkeypatch.setattr(agent, "print_progress_summary", lambda project_dir: None)
+    monkeypatch.setattr(agent, "print_session_header", lambda iteration, is_initializer: None)
+    monkeypatch.setattr(agent, "create_client", lambda *args, **kwargs: _FakeClient())
+    monkeypatch.setattr(agent, "get_coding_prompt", lambda project_dir, yolo_mode=False: "prompt")
+    monkeypatch.setattr(agent, "run_agent_session", fake_session)
+    monkeypatch.setattr(agent.asyncio, "sleep", fake_sleep)
+
+    asyncio.run(agent.run_autonomous_agent(
+        tmp_path, "test-model", max_iterations=iterations, agent_type="coding",
+    ))
+
+    # Each iteration sleeps for the backoff, then 1s before the next session
+    # (the last iteration skips the 1s pause)
+    return sleeps[0::2]
+
+
+def test_consecutive_rate_limits_climb_the_backoff_ladder(monkeypatch, tmp_path):
+    """A streak of rate limits never waits less than the exponential base."""
+    ladder = [15, 30, 60, 120, 240, 480, 960, 1920, 3600, 3600]
+    delays = _run_rate_limited_loop(monkeypatch, tmp_path, len(ladder))
+
+    assert len(delays) == len(ladder)
+    # First wait is the base plus 0-30% jitter
+    assert ladder[0] <= delays[0] <= int(ladder[0] * 1.3)
+    for retries in range(1, len(ladder)):
+        base = ladder[retries]
+        ceiling = max(min(delays[retries - 1] * 3, 3600), base)
+        assert base <= delays[retries] <= ceiling, f"Retry {retries}: {delays}"
+
@@ -8,10 +8,11 @@ Run with: python -m pytest tests/test_codebase_analyzer.py -v
 """
 
 import json
-import tempfile
-import unittest
+from collections.abc import Callable
 from pathlib import Path
 
+import pytest
+
 from server.services.codebase_analyzer import (
     CodebaseAnalysis,
     Dependency,
@@ -24,306 +25,339 @@ from server.services.codebase_analyzer import (
     analyze_codebase,
 )
 
+# =============================================================================
+# Shared layouts
+# =============================================================================
+
+
+# package.json bodies are serialized once at import and written verbatim
+_REACT_VITE_TS_PACKAGE_JSON = json.dumps({
+    "name": "test-app",
+    "dependencies": {
+        "react": "^18.0.0",
+        "react-dom": "^18.0.0"
+    },
+    "devDependencies": {
+        "vite": "^5.0.0",
+        "typescript": "^5.0.0"
+    }
+})
+
+_NEXTJS_PACKAGE_JSON = json.dumps({
+    "name": "next-app",
+    "dependencies": {
+        "react": "^18.0.0",
+        "next": "^14.0.0"
+    }
+})
+
+_TAILWIND_PACKAGE_JSON = json.dumps({
+    "devDependencies": {
+        "tailwindcss": "^3.4.0"
+    }
+})
+
+_STYLED_COMPONENTS_PACKAGE_JSON = json.dumps({
+    "dependencies": {
+        "react": "^18.0.0",
+        "styled-components": "^6.0.0"
+    }
+})
+
+
+def _build_react_vite_ts(project_dir: Path) -> None:
+    """React + Vite + TypeScript project managed with pnpm."""
+    (project_dir / "package.json").write_text(_REACT_VITE_TS_PACKAGE_JSON)
+    (project_dir / "pnpm-lock.yaml").touch()
+
+
+def _build_nextjs(project_dir: Path) -> None:
+    """React project using Next.js."""
+    (project_dir / "package.json").write_text(_NEXTJS_PACKAGE_JSON)
+
+
+def _build_python_fastapi(project_dir: Path) -> None:
+    """Python FastAPI project declared in requirements.txt."""
+    (project_dir / "requirements.txt").write_text("fastapi==0.100.0\nuvicorn==0.22.0\n")
+    (project_dir / "main.py").touch()
+
+
+def _build_tailwind(project_dir: Path) -> None:
+    """Project using Tailwind CSS with a JS config file."""
+    (project_dir / "package.json").write_text(_TAILWIND_PACKAGE_JSON)
+    (project_dir / "tailwind.config.js").touch()
+
+
+def _build_styled_components(project_dir: Path) -> None:
+    """React project styled with styled-components."""
+    (project_dir / "package.json").write_text(_STYLED_COMPONENTS_PACKAGE_JSON)
+
+
+def _build_readme(project_dir: Path) -> None:
+    """Project with a titled README.md."""
+    (project_dir / "README.md").write_text("# My Project\n\nDescription here.")
+
+
+def _build_multiple_docs(project_dir: Path) -> None:
+    """Project with README, CHANGELOG and CONTRIBUTING docs."""
+    (project_dir / "README.md").write_text("# README")
+    (project_dir / "CHANGELOG.md").write_text("# Changelog")
+    (project_dir / "CONTRIBUTING.md").write_text("# Contributing")
+
+
+def _build_autoforge_specs(project_dir: Path) -> None:
+    """Project with an AutoForge app spec."""
+    prompts_dir = project_dir / ".autoforge" / "prompts"
+    prompts_dir.mkdir(parents=True)
+    (prompts_dir / "app_spec.txt").write_text("Project spec content")
+
+
+def _build_prd(project_dir: Path) -> None:
+    """Project with a PRD.md."""
+    (project_dir / "PRD.md").write_text("# Product Requirements\n\nDetails...")
+
+
+def _build_todo_comment(project_dir: Path) -> None:
+    """Python source file containing a TODO comment."""
+    (project_dir / "main.py").write_text(
+        "def foo():\n"
+        "    # TODO: Implement this function\n"
+        "    pass\n"
+    )
+
+
+def _build_fixme_comment(project_dir: Path) -> None:
+    """TypeScript source file containing a FIXME comment."""
+    (project_dir / "app.ts").write_text(
+        "function bar() {\n"
+        "    // FIXME: Handle edge case\n"
+        "    return null;\n"
+        "}\n"
+    )
+
+
+def _build_src_directory(project_dir: Path) -> None:
+    """Project with a src/ directory and entry point."""
+    (project_dir / "src").mkdir()
+    (project_dir / "src" / "index.ts").touch()
+
+
+def _build_test_directories(project_dir: Path) -> None:
+    """Project with tests/ and __tests__/ directories."""
+    (project_dir / "tests").mkdir()
+    (project_dir / "__tests__").mkdir()
+
+
+@pytest.fixture(scope="module")
+def analyze_layout(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Callable[[str, Callable[[Path], None]], CodebaseAnalysis]:
+    """Build a layout and analyze it once per module; later calls reuse the result.
+
+    Only use this for read-only assertions - the returned analysis is shared.
+    """
+    cache: dict[str, CodebaseAnalysis] = {}
+
+    def analyze(layout_key: str, build_fn: Callable[[Path], None]) -> CodebaseAnalysis:
+        if layout_key not in cache:
+            project_dir = tmp_path_factory.mktemp(layout_key)
+            build_fn(project_dir)
+            cache[layout_key] = analyze_codebase(project_dir)
+        return cache[layout_key]
+
+    return analyze
+
+
+# =============================================================================
+# Tech stack detection
+# =============================================================================
+
+
+def test_detects_react_vite_typescript(analyze_layout):
+    """Detect a React + Vite + TypeScript project."""
+    analysis = analyze_layout("react_vite_ts", _build_react_vite_ts)
+
+    assert analysis.tech_stack.framework == "react"
+    assert analysis.tech_stack.build_tool == "vite"
+    assert analysis.tech_stack.language == "typescript"
+    assert analysis.tech_stack.package_manager == "pnpm"
+
+
+def test_detects_nextjs_project(analyze_layout):
+    """Detect a Next.js project."""
+    analysis = analyze_layout("nextjs", _build_nextjs)
+
+    assert analysis.tech_stack.framework == "react"
+    assert analysis.tech_stack.meta_framework == "next"
+
+
+def test_detects_python_fastapi(analyze_layout):
+    """Detect a Python FastAPI project."""
+    analysis = analyze_layout("python_fastapi", _build_python_fastapi)
+
+    assert analysis.tech_stack.language == "python"
+    assert len(analysis.dependencies) == 2
+    assert any(d.name == "fastapi" for d in analysis.dependencies)
+
+
+# =============================================================================
+# Styling detection
+# =============================================================================
+
+
+def test_detects_tailwind(analyze_layout):
+    """Detect Tailwind CSS."""
+    analysis = analyze_layout("tailwind", _build_tailwind)
+
+    assert analysis.styling.css_framework == "tailwind"
+    assert analysis.styling.theme_file == "tailwind.config.js"
+
+
+def test_detects_styled_components(analyze_layout):
+    """Detect styled-components."""
+    analysis = analyze_layout("styled_components", _build_styled_components)
+
+    assert analysis.styling.css_approach == "styled-components"
+
+
+# =============================================================================
+# Documentation
+# =============================================================================
+
+
+def test_finds_readme(analyze_layout):
+    """Find README.md file."""
+    analysis = analyze_layout("readme", _build_readme)
+
+    assert analysis.docs_by_type["readme"][0].title == "My Project"
+
+
+def test_finds_multiple_docs(analyze_layout):
+    """Find multiple documentation files."""
+    analysis = analyze_layout("multiple_docs", _build_multiple_docs)
+
+    assert len(analysis.docs) >= 3
+
+
+# =============================================================================
+# Spec detection
+# =============================================================================
+
+
+def test_finds_autoforge_specs(analyze_layout):
+    """Find AutoForge spec files."""
+    analysis = analyze_layout("autoforge_specs", _build_autoforge_specs)
+
+    assert "autoforge" in analysis.specs_by_type
+
+
+def test_finds_prd(analyze_layout):
+    """Find PRD file."""
+    analysis = analyze_layout("prd", _build_prd)
+
+    assert "prd" in analysis.specs_by_type
+
+
+# =============================================================================
+# Task detection
+# =============================================================================
+
+
+def test_finds_todo_comments(analyze_layout):
+    """Find TODO comments in source files."""
+    analysis = analyze_layout("todo_comment", _build_todo_comment)
+
+    todos = analysis.tasks_by_ref_type["todo"]
+    assert "Implement this function" in todos[0].content
+
+
+def test_finds_fixme_comments(analyze_layout):
+    """Find FIXME comments in source files."""
+    analysis = analyze_layout("fixme_comment", _build_fixme_comment)
+
+    assert len(analysis.tasks_by_ref_type["fixme"]) >= 1
+
+
+# =============================================================================
+# Project structure
+# =============================================================================
+
+
+def test_detects_src_directory(analyze_layout):
+    """Detect src directory."""
+    analysis = analyze_layout("src_directory", _build_src_directory)
+
+    assert "src" in analysis.structure.key_directories
+    assert "src/index.ts" in analysis.structure.entry_points
+
+
+def test_detects_test_directories(analyze_layout):
+    """Detect test directories."""
+    analysis = analyze_layout("test_directories", _build_test_directories)
+
+    assert "tests" in analysis.structure.test_dirs
+    assert "__tests__" in analysis.structure.test_dirs
+
+
+# =============================================================================
+# Output formats
+# =============================================================================
+
+
+def test_to_dict_serializable(tmp_path):
+    """Ensure to_dict produces JSON-serializable output."""
+    (tmp_path / "README.md").write_text("# Test")
+
+    analysis = analyze_codebase(tmp_path)
+    result = analysis.to_dict()
+
+    # Should be JSON serializable
+    json_str = json.dumps(result)
+    assert isinstance(json_str, str)
+
+
+def test_to_summary_readable(analyze_layout):
+    """Ensure to_summary produces readable text."""
+    analysis = analyze_layout("react_vite_ts", _build_react_vite_ts)
+    summary = analysis.to_summary()
+
+    assert "Codebase Analysis" in summary
+    assert "Tech Stack" in summary
+
+
+# =============================================================================
+# Error handling
+# =============================================================================
+
+
+def test_invalid_directory_raises_error():
+    """Invalid directory should raise ValueError."""
+    with pytest.raises(ValueError):
+        analyze_codebase(Path("/nonexistent/path"))
+
+
+def test_handles_malformed_package_json(tmp_path):
+    """Handle malformed package.json gracefully."""
+    (tmp_path / "package.json").write_text("{ invalid json")
+
+    # Should not raise, just return analysis without package.json data
+    analysis = analyze_codebase(tmp_path)
+    assert analysis.raw_package_json is None
+
+
+# =============================================================================
+# Freshness
+# =============================================================================
+
+
+def test_in_place_edit_is_picked_up(tmp_path):
+    """Editing an existing file is reflected in the next analysis."""
+    (tmp_path / "package.json").write_text(_NEXTJS_PACKAGE_JSON)
+    first = analyze_codebase(tmp_path)
+
+    (tmp_path / "package.json").write_text(json.dumps({"dependencies": {"vue": "^3.4.0"}}))
 
-class TestTechStackDetection(unittest.TestCase):
-    """Tests for technology stack detection."""
-
-    def test_detects_react_vite_typescript(self):
-        """Detect a React + Vite + TypeScript project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            # Create package.json
-            package_json = {
-                "name": "test-app",
-                "dependencies": {
-                    "react": "^18.0.0",
-                    "react-dom": "^18.0.0"
-                },
-                "devDependencies": {
-                    "vite": "^5.0.0",
-                    "typescript": "^5.0.0"
-                }
-            }
-            with open(project_dir / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            # Create lock file
-            (project_dir / "pnpm-lock.yaml").touch()
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertEqual(analysis.tech_stack.framework, "react")
-            self.assertEqual(analysis.tech_stack.build_tool, "vite")
-            self.assertEqual(analysis.tech_stack.language, "typescript")
-            self.assertEqual(analysis.tech_stack.package_manager, "pnpm")
-
-    def test_detects_nextjs_project(self):
-        """Detect a Next.js project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            package_json = {
-                "name": "next-app",
-                "dependencies": {
-                    "react": "^18.0.0",
-                    "next": "^14.0.0"
-                }
-            }
-            with open(project_dir / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertEqual(analysis.tech_stack.framework, "react")
-            self.assertEqual(analysis.tech_stack.meta_framework, "next")
-
-    def test_detects_python_fastapi(self):
-        """Detect a Python FastAPI project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            # Create requirements.txt
-            with open(project_dir / "requirements.txt", "w") as f:
-                f.write("fastapi==0.100.0\nuvicorn==0.22.0\n")
-            
-            # Create main.py
-            (project_dir / "main.py").touch()
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertEqual(analysis.tech_stack.language, "python")
-            self.assertEqual(len(analysis.dependencies), 2)
-            self.assertTrue(any(d.name == "fastapi" for d in analysis.dependencies))
-
-
-class TestStylingDetection(unittest.TestCase):
-    """Tests for styling and design system detection."""
-
-    def test_detects_tailwind(self):
-        """Detect Tailwind CSS."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            package_json = {
-                "devDependencies": {
-                    "tailwindcss": "^3.4.0"
-                }
-            }
-            with open(project_dir / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            # Create tailwind config
-            (project_dir / "tailwind.config.js").touch()
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertEqual(analysis.styling.css_framework, "tailwind")
-            self.assertEqual(analysis.styling.theme_file, "tailwind.config.js")
-
-    def test_detects_styled_components(self):
-        """Detect styled-components."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            package_json = {
-                "dependencies": {
-                    "react": "^18.0.0",
-                    "styled-components": "^6.0.0"
-                }
-            }
-            with open(project_dir / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertEqual(analysis.styling.css_approach, "styled-components")
-
-
-class TestDocumentation(unittest.TestCase):
-    """Tests for documentation file detection."""
-
-    def test_finds_readme(self):
-        """Find README.md file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            with open(project_dir / "README.md", "w") as f:
-                f.write("# My Project\n\nDescription here.")
-            
-            analysis = analyze_codebase(project_dir)
-            
-            readme = next((d for d in analysis.docs if d.doc_type == "readme"), None)
-            self.assertIsNotNone(readme)
-            self.assertEqual(readme.title, "My Project")
-
-    def test_finds_multiple_docs(self):
-        """Find multiple documentation files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "README.md").write_text("# README")
-            (project_dir / "CHANGELOG.md").write_text("# Changelog")
-            (project_dir / "CONTRIBUTING.md").write_text("# Contributing")
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertGreaterEqual(len(analysis.docs), 3)
-
-
-class TestSpecDetection(unittest.TestCase):
-    """Tests for spec/planning file detection."""
-
-    def test_finds_autoforge_specs(self):
-        """Find AutoForge spec files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            prompts_dir = project_dir / ".autoforge" / "prompts"
-            prompts_dir.mkdir(parents=True)
-            (prompts_dir / "app_spec.txt").write_text("Project spec content")
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertTrue(any(s.spec_type == "autoforge" for s in analysis.specs))
-
-    def test_finds_prd(self):
-        """Find PRD file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "PRD.md").write_text("# Product Requirements\n\nDetails...")
-            
-            analysis = analyze_codebase(project_dir)
-            
-            prd = next((s for s in analysis.specs if s.spec_type == "prd"), None)
-            self.assertIsNotNone(prd)
-
-
-class TestTaskDetection(unittest.TestCase):
-    """Tests for TODO/task detection."""
-
-    def test_finds_todo_comments(self):
-        """Find TODO comments in source files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "main.py").write_text(
-                "def foo():\n"
-                "    # TODO: Implement this function\n"
-                "    pass\n"
-            )
-            
-            analysis = analyze_codebase(project_dir)
-            
-            todos = [t for t in analysis.tasks if t.ref_type == "todo"]
-            self.assertGreaterEqual(len(todos), 1)
-            self.assertIn("Implement this function", todos[0].content)
-
-    def test_finds_fixme_comments(self):
-        """Find FIXME comments in source files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "app.ts").write_text(
-                "function bar() {\n"
-                "    // FIXME: Handle edge case\n"
-                "    return null;\n"
-                "}\n"
-            )
-            
-            analysis = analyze_codebase(project_dir)
-            
-            fixmes = [t for t in analysis.tasks if t.ref_type == "fixme"]
-            self.assertGreaterEqual(len(fixmes), 1)
-
-
-class TestProjectStructure(unittest.TestCase):
-    """Tests for project structure analysis."""
-
-    def test_detects_src_directory(self):
-        """Detect src directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "src").mkdir()
-            (project_dir / "src" / "index.ts").touch()
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertIn("src", analysis.structure.key_directories)
-            self.assertIn("src/index.ts", analysis.structure.entry_points)
-
-    def test_detects_test_directories(self):
-        """Detect test directories."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "tests").mkdir()
-            (project_dir / "__tests__").mkdir()
-            
-            analysis = analyze_codebase(project_dir)
-            
-            self.assertIn("tests", analysis.structure.test_dirs)
-            self.assertIn("__tests__", analysis.structure.test_dirs)
-
-
-class TestAnalysisOutput(unittest.TestCase):
-    """Tests for analysis output formats."""
-
-    def test_to_dict_serializable(self):
-        """Ensure to_dict produces JSON-serializable output."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            (project_dir / "README.md").write_text("# Test")
-            
-            analysis = analyze_codebase(project_dir)
-            result = analysis.to_dict()
-            
-            # Should be JSON serializable
-            json_str = json.dumps(result)
-            self.assertIsInstance(json_str, str)
-
-    def test_to_summary_readable(self):
-        """Ensure to_summary produces readable text."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            package_json = {
-                "dependencies": {"react": "^18.0.0"},
-                "devDependencies": {"typescript": "^5.0.0"}
-            }
-            with open(project_dir / "package.json", "w") as f:
-                json.dump(package_json, f)
-            
-            analysis = analyze_codebase(project_dir)
-            summary = analysis.to_summary()
-            
-            self.assertIn("Codebase Analysis", summary)
-            self.assertIn("Tech Stack", summary)
-
-
-class TestErrorHandling(unittest.TestCase):
-    """Tests for error handling."""
-
-    def test_invalid_directory_raises_error(self):
-        """Invalid directory should raise ValueError."""
-        with self.assertRaises(ValueError):
-            analyze_codebase(Path("/nonexistent/path"))
-
-    def test_handles_malformed_package_json(self):
-        """Handle malformed package.json gracefully."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            project_dir = Path(tmpdir)
-            
-            with open(project_dir / "package.json", "w") as f:
-                f.write("{ invalid json")
-            
-            # Should not raise, just return analysis without package.json data
-            analysis = analyze_codebase(project_dir)
-            self.assertIsNone(analysis.raw_package_json)
-
-
-if __name__ == "__main__":
-    unittest.main()
+    second = analyze_codebase(tmp_path)
+    assert second is not first
+    assert first.tech_stack.framework == "react"
+    assert second.tech_stack.framework == "vue"
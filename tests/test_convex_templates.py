@@ -10,17 +10,63 @@ Validates:
 4. Mock data patterns are correctly identified
 """
 
-import os
 import re
-import sys
-from pathlib import Path
 
 import pytest
 
-# Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from autoforge.data.paths import TEMPLATES_DIR
+@pytest.fixture(scope="session")
+def templates_dir():
+    """Templates directory, imported lazily so collection stays cheap."""
+    from autoforge.data.paths import TEMPLATES_DIR
+
+    return TEMPLATES_DIR
+
+
+# Each template is read from disk once per session and shared by every test
+
+
+@pytest.fixture(scope="session")
+def app_spec_template(templates_dir):
+    return (templates_dir / "app_spec.template.txt").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def initializer_template(templates_dir):
+    return (templates_dir / "initializer_prompt.template.md").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def initializer_template_lower(initializer_template):
+    return initializer_template.lower()
+
+
+@pytest.fixture(scope="session")
+def coding_template(templates_dir):
+    return (templates_dir / "coding_prompt.template.md").read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def convex_arch_doc(templates_dir):
+    doc_path = templates_dir / "CONVEX_ARCHITECTURE.md"
+    if not doc_path.exists():
+        pytest.skip("CONVEX_ARCHITECTURE.md not present")
+    return doc_path.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def infrastructure_section(initializer_template):
+    # Two find() calls and one slice; no intermediate split() lists
+    start = initializer_template.find("## MANDATORY INFRASTRUCTURE FEATURES")
+    assert start != -1, "initializer template lost its infrastructure section"
+    end = initializer_template.find("## MANDATORY TEST CATEGORIES", start)
+    assert end != -1, "initializer template lost its test categories section"
+    return initializer_template[start:end]
+
+
+@pytest.fixture(scope="session")
+def infrastructure_section_lower(infrastructure_section):
+    return infrastructure_section.lower()
 
 
 # =============================================================================
@@ -31,180 +77,163 @@ from autoforge.data.paths import TEMPLATES_DIR
 class TestAppSpecTemplate:
     """Test app_spec.template.txt for Convex patterns."""
 
-    @pytest.fixture
-    def template_content(self):
-        template_path = TEMPLATES_DIR / "app_spec.template.txt"
-        return template_path.read_text()
-
-    def test_convex_backend_defined(self, template_content):
+    def test_convex_backend_defined(self, app_spec_template):
         """Verify backend uses Convex runtime."""
-        assert "<runtime>Convex (reactive backend)</runtime>" in template_content
+        assert "<runtime>Convex (reactive backend)</runtime>" in app_spec_template
 
-    def test_convex_database_defined(self, template_content):
+    def test_convex_database_defined(self, app_spec_template):
         """Verify database is Convex document database."""
-        assert "<database>Convex document database</database>" in template_content
+        assert "<database>Convex document database</database>" in app_spec_template
 
-    def test_convex_realtime_defined(self, template_content):
+    def test_convex_realtime_defined(self, app_spec_template):
         """Verify realtime is WebSocket based."""
-        assert "WebSocket subscriptions" in template_content
+        assert "WebSocket subscriptions" in app_spec_template
 
-    def test_convex_helpers_defined(self, template_content):
+    def test_convex_helpers_defined(self, app_spec_template):
         """Verify convex-helpers is referenced."""
-        assert "convex-helpers" in template_content
+        assert "convex-helpers" in app_spec_template
 
-    def test_convex_architecture_section_exists(self, template_content):
+    def test_convex_architecture_section_exists(self, app_spec_template):
         """Verify <convex_architecture> section exists."""
-        assert "<convex_architecture>" in template_content
-        assert "</convex_architecture>" in template_content
+        assert "<convex_architecture>" in app_spec_template
+        assert "</convex_architecture>" in app_spec_template
 
-    def test_convex_schema_pattern(self, template_content):
+    def test_convex_schema_pattern(self, app_spec_template):
         """Verify schema uses defineTable pattern."""
-        assert "defineTable" in template_content
-        assert "v.string()" in template_content
-        assert "v.id(" in template_content
+        assert "defineTable" in app_spec_template
+        assert "v.string()" in app_spec_template
+        assert "v.id(" in app_spec_template
 
-    def test_convex_functions_section(self, template_content):
+    def test_convex_functions_section(self, app_spec_template):
         """Verify Convex functions section exists."""
-        assert "<convex_functions>" in template_content or "queries:" in template_content
-        assert "mutations:" in template_content
+        assert "<convex_functions>" in app_spec_template or "queries:" in app_spec_template
+        assert "mutations:" in app_spec_template
 
-    def test_no_express_references(self, template_content):
-        """Verify no Node/Express references remain."""
-        assert "Node.js with Express" not in template_content
-        assert "SQLite with better-sqlite3" not in template_content
-        assert "<port>3001</port>" not in template_content
+    def test_no_legacy_backend_references(self, app_spec_template):
+        """Verify no Node/Express or SQLite backend references remain."""
+        assert "Node.js with Express" not in app_spec_template
+        assert "SQLite with better-sqlite3" not in app_spec_template
+        assert "<port>3001</port>" not in app_spec_template
+        assert "POST /api/" not in app_spec_template
+        assert "GET /api/" not in app_spec_template
 
 
 class TestInitializerPromptTemplate:
     """Test initializer_prompt.template.md for Convex patterns."""
 
-    @pytest.fixture
-    def template_content(self):
-        template_path = TEMPLATES_DIR / "initializer_prompt.template.md"
-        return template_path.read_text()
-
-    def test_infrastructure_feature_0_convex(self, template_content):
+    def test_infrastructure_feature_0_convex(self, initializer_template):
         """Verify feature 0 uses Convex dev server."""
-        assert "Convex dev server starts" in template_content
-        assert "`npx convex dev`" in template_content
+        assert "Convex dev server starts" in initializer_template
+        assert "`npx convex dev`" in initializer_template
 
-    def test_infrastructure_feature_1_schema(self, template_content):
+    def test_infrastructure_feature_1_schema(self, initializer_template, initializer_template_lower):
         """Verify feature 1 checks schema deployment."""
-        assert "Schema deployed" in template_content
-        assert "dashboard" in template_content.lower()
+        assert "Schema deployed" in initializer_template
+        assert "dashboard" in initializer_template_lower
 
-    def test_infrastructure_feature_2_persistence(self, template_content):
+    def test_infrastructure_feature_2_persistence(self, initializer_template):
         """Verify feature 2 tests data persistence."""
-        assert "Data persists" in template_content
-        assert "mutation" in template_content
+        assert "Data persists" in initializer_template
+        assert "mutation" in initializer_template
 
-    def test_infrastructure_feature_3_mock_patterns(self, template_content):
+    def test_infrastructure_feature_3_mock_patterns(self, initializer_template):
         """Verify feature 3 checks for mock patterns."""
-        assert "No mock" in template_content
-        assert "grep" in template_content
+        assert "No mock" in initializer_template
+        assert "grep" in initializer_template
 
-    def test_infrastructure_feature_4_real_queries(self, template_content):
+    def test_infrastructure_feature_4_real_queries(self, initializer_template, initializer_template_lower):
         """Verify feature 4 checks real database queries."""
-        assert "Convex functions query" in template_content or "function logs" in template_content.lower()
+        assert "Convex functions query" in initializer_template or "function logs" in initializer_template_lower
 
-    def test_init_sh_uses_convex_dev(self, template_content):
+    def test_init_sh_uses_convex_dev(self, initializer_template):
         """Verify init.sh example uses npx convex dev."""
-        assert "npx convex dev --once" in template_content
-        assert "npx convex dev &" in template_content
-        assert "npm run dev" in template_content
+        assert "npx convex dev --once" in initializer_template
+        assert "npx convex dev &" in initializer_template
+        assert "npm run dev" in initializer_template
 
-    def test_project_structure_has_convex_folder(self, template_content):
+    def test_project_structure_has_convex_folder(self, initializer_template):
         """Verify project structure includes convex/ folder."""
-        assert "convex/" in template_content
-        assert "schema.ts" in template_content
-        assert "domain/" in template_content
+        assert "convex/" in initializer_template
+        assert "schema.ts" in initializer_template
+        assert "domain/" in initializer_template
 
-    def test_no_sqlite_references(self, template_content):
+    def test_no_sqlite_references(self, infrastructure_section_lower):
         """Verify no SQLite references remain in infrastructure features."""
         # Check infrastructure features section specifically
-        infra_section = template_content.split("## MANDATORY INFRASTRUCTURE FEATURES")[1]
-        infra_section = infra_section.split("## MANDATORY TEST CATEGORIES")[0]
-        assert "sqlite3" not in infra_section.lower()
-        assert "psql" not in infra_section.lower()
+        assert "sqlite3" not in infrastructure_section_lower
+        assert "psql" not in infrastructure_section_lower
+
+    def test_no_legacy_backend_references(self, initializer_template):
+        """Verify no Node/Express or SQLite backend references remain."""
+        assert "Node.js with Express" not in initializer_template
+        assert "SQLite with better-sqlite3" not in initializer_template
+        assert "<port>3001</port>" not in initializer_template
+        assert "POST /api/" not in initializer_template
+        assert "GET /api/" not in initializer_template
 
 
 class TestCodingPromptTemplate:
     """Test coding_prompt.template.md for Convex patterns."""
 
-    @pytest.fixture
-    def template_content(self):
-        template_path = TEMPLATES_DIR / "coding_prompt.template.md"
-        return template_path.read_text()
-
-    def test_step2_convex_server_instructions(self, template_content):
+    def test_step2_convex_server_instructions(self, coding_template):
         """Verify STEP 2 has Convex server startup instructions."""
-        assert "npx convex dev" in template_content
-        assert "localhost:5173" in template_content or "Vite app" in template_content
+        assert "npx convex dev" in coding_template
+        assert "localhost:5173" in coding_template or "Vite app" in coding_template
 
-    def test_step55_verification_checklist_convex(self, template_content):
+    def test_step55_verification_checklist_convex(self, coding_template):
         """Verify STEP 5.5 mentions Convex-specific checks."""
-        assert "Convex" in template_content
-        assert "mutation" in template_content or "useQuery" in template_content
+        assert "Convex" in coding_template
+        assert "mutation" in coding_template or "useQuery" in coding_template
 
-    def test_step56_mock_detection_convex_folder(self, template_content):
+    def test_step56_mock_detection_convex_folder(self, coding_template):
         """Verify STEP 5.6 grep includes convex/ folder."""
-        assert "convex/" in template_content
-        assert 'grep -r' in template_content
+        assert "convex/" in coding_template
+        assert "grep -r" in coding_template
 
-    def test_step57_convex_restart_test(self, template_content):
+    def test_step57_convex_restart_test(self, coding_template):
         """Verify STEP 5.7 uses Convex restart method."""
-        assert "CONVEX" in template_content or "npx convex dev" in template_content
+        assert "CONVEX" in coding_template or "npx convex dev" in coding_template
 
-    def test_no_express_api_references(self, template_content):
-        """Verify no Express API patterns remain."""
-        # These should not be in the main instructions
-        assert "POST /api/" not in template_content
-        assert "GET /api/" not in template_content
+    def test_no_legacy_backend_references(self, coding_template):
+        """Verify no Node/Express or SQLite backend references remain."""
+        assert "Node.js with Express" not in coding_template
+        assert "SQLite with better-sqlite3" not in coding_template
+        assert "<port>3001</port>" not in coding_template
+        assert "POST /api/" not in coding_template
+        assert "GET /api/" not in coding_template
 
 
 class TestConvexArchitectureDoc:
     """Test CONVEX_ARCHITECTURE.md documentation."""
 
-    @pytest.fixture
-    def doc_content(self):
-        doc_path = TEMPLATES_DIR / "CONVEX_ARCHITECTURE.md"
-        if doc_path.exists():
-            return doc_path.read_text()
-        return None
-
-    def test_doc_exists(self, doc_content):
+    def test_doc_exists(self, templates_dir):
         """Verify documentation exists."""
-        assert doc_content is not None, "CONVEX_ARCHITECTURE.md should exist"
+        assert (templates_dir / "CONVEX_ARCHITECTURE.md").exists(), "CONVEX_ARCHITECTURE.md should exist"
 
-    def test_schema_pattern_documented(self, doc_content):
+    def test_schema_pattern_documented(self, convex_arch_doc):
         """Verify schema pattern is documented."""
-        if doc_content:
-            assert "defineSchema" in doc_content
-            assert "defineTable" in doc_content
+        assert "defineSchema" in convex_arch_doc
+        assert "defineTable" in convex_arch_doc
 
-    def test_query_pattern_documented(self, doc_content):
+    def test_query_pattern_documented(self, convex_arch_doc):
         """Verify query pattern is documented."""
-        if doc_content:
-            assert "query" in doc_content
-            assert "ctx.db" in doc_content
+        assert "query" in convex_arch_doc
+        assert "ctx.db" in convex_arch_doc
 
-    def test_mutation_pattern_documented(self, doc_content):
+    def test_mutation_pattern_documented(self, convex_arch_doc):
         """Verify mutation pattern is documented."""
-        if doc_content:
-            assert "mutation" in doc_content
-            assert "ctx.db.insert" in doc_content
+        assert "mutation" in convex_arch_doc
+        assert "ctx.db.insert" in convex_arch_doc
 
-    def test_react_integration_documented(self, doc_content):
+    def test_react_integration_documented(self, convex_arch_doc):
         """Verify React integration is documented."""
-        if doc_content:
-            assert "useQuery" in doc_content
-            assert "useMutation" in doc_content
+        assert "useQuery" in convex_arch_doc
+        assert "useMutation" in convex_arch_doc
 
-    def test_convex_helpers_documented(self, doc_content):
+    def test_convex_helpers_documented(self, convex_arch_doc):
         """Verify convex-helpers is documented."""
-        if doc_content:
-            assert "convex-helpers" in doc_content
-            assert "rateLimitTables" in doc_content
+        assert "convex-helpers" in convex_arch_doc
+        assert "rateLimitTables" in convex_arch_doc
 
 
 # =============================================================================
@@ -225,15 +254,17 @@ class TestMockDataPatterns:
         r"mockUsers",
         r"return \[\]",  # Empty array returns
     ]
+    # One compiled alternation instead of a search per pattern
+    MOCK_RE = re.compile("|".join(f"(?:{p})" for p in MOCK_PATTERNS))
 
-    @pytest.fixture
-    def coding_template(self):
-        return (TEMPLATES_DIR / "coding_prompt.template.md").read_text()
-
-    def test_all_mock_patterns_in_grep(self, coding_template):
+    @pytest.mark.parametrize("pattern", ["mockData", "fakeData", "dummyData"])
+    def test_all_mock_patterns_in_grep(self, coding_template, pattern):
         """Verify mock data grep includes key patterns."""
-        for pattern in ["mockData", "fakeData", "dummyData"]:
-            assert pattern in coding_template, f"Pattern '{pattern}' should be in mock detection"
+        assert pattern in coding_template, f"Pattern '{pattern}' should be in mock detection"
+
+    def test_mock_patterns_found_in_template(self, coding_template):
+        """Verify the template's mock detection section matches the patterns."""
+        assert self.MOCK_RE.search(coding_template)
 
     def test_convex_folder_in_grep(self, coding_template):
         """Verify grep searches convex/ folder."""
@@ -283,30 +314,28 @@ class TestTemplateRendering:
 class TestInfrastructureFeatures:
     """Validate infrastructure feature definitions."""
 
-    @pytest.fixture
-    def infrastructure_section(self):
-        template_path = TEMPLATES_DIR / "initializer_prompt.template.md"
-        content = template_path.read_text()
-        # Extract infrastructure features section
-        start = content.find("## MANDATORY INFRASTRUCTURE FEATURES")
-        end = content.find("## MANDATORY TEST CATEGORIES")
-        return content[start:end]
+    EXPECTED_FEATURES = {"0", "1", "2", "3", "4"}
+    # Table rows like "| 0 |" and headings like "Feature 0", each found in one scan
+    TABLE_ROW_RE = re.compile(r"\| (\d+) \|")
+    FEATURE_RE = re.compile(r"Feature (\d+)")
 
     def test_has_five_infrastructure_features(self, infrastructure_section):
         """Verify all 5 infrastructure features are defined."""
-        for i in range(5):
-            assert f"| {i} |" in infrastructure_section, f"Feature {i} should be defined"
+        rows = set(self.TABLE_ROW_RE.findall(infrastructure_section))
+        missing = self.EXPECTED_FEATURES - rows
+        assert not missing, f"Features {sorted(missing)} should be defined"
 
     def test_feature_verification_steps_defined(self, infrastructure_section):
         """Verify each feature has verification steps."""
-        for i in range(5):
-            assert f"Feature {i}" in infrastructure_section, f"Feature {i} description should exist"
-            assert "Steps:" in infrastructure_section
+        described = set(self.FEATURE_RE.findall(infrastructure_section))
+        missing = self.EXPECTED_FEATURES - described
+        assert not missing, f"Feature descriptions {sorted(missing)} should exist"
+        assert "Steps:" in infrastructure_section
 
-    def test_convex_specific_commands(self, infrastructure_section):
+    def test_convex_specific_commands(self, infrastructure_section, infrastructure_section_lower):
         """Verify Convex-specific commands in verification."""
         assert "npx convex dev" in infrastructure_section
-        assert "dashboard" in infrastructure_section.lower()
+        assert "dashboard" in infrastructure_section_lower
 
 
 # =============================================================================
@@ -4,16 +4,18 @@ Dependency Resolver Tests
 =========================
 
 Tests for the dependency resolver functions including cycle detection.
-Run with: python test_dependency_resolver.py
+Run with: python -m pytest tests/test_dependency_resolver.py
 """
 
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+import pytest
 
 from api.dependency_resolver import (
+    _downstream_counts,
     are_dependencies_satisfied,
+    build_feature_map,
     compute_scheduling_scores,
     get_blocked_features,
     get_blocking_dependencies,
@@ -25,8 +27,6 @@ from api.dependency_resolver import (
 
 def test_compute_scheduling_scores_simple_chain():
     """Test scheduling scores for a simple linear dependency chain."""
-    print("\nTesting compute_scheduling_scores with simple chain:")
-
     features = [
         {"id": 1, "priority": 1, "dependencies": []},
         {"id": 2, "priority": 2, "dependencies": [1]},
@@ -36,137 +36,56 @@ def test_compute_scheduling_scores_simple_chain():
     scores = compute_scheduling_scores(features)
 
     # All features should have scores
-    passed = True
-    for f in features:
-        if f["id"] not in scores:
-            print(f"  FAIL: Feature {f['id']} missing from scores")
-            passed = False
-
-    if passed:
-        # Root feature (1) should have highest score (unblocks most)
-        if scores[1] > scores[2] > scores[3]:
-            print("  PASS: Root feature has highest score, leaf has lowest")
-        else:
-            print(f"  FAIL: Expected scores[1] > scores[2] > scores[3], got {scores}")
-            passed = False
-
-    return passed
-
-
-def test_compute_scheduling_scores_with_cycle():
+    assert set(scores) == {1, 2, 3}
+    # Root feature (1) should have highest score (unblocks most)
+    assert scores[1] > scores[2] > scores[3], f"Root should score highest, leaf lowest: {scores}"
+
+
+@pytest.mark.parametrize(
+    "features",
+    [
+        pytest.param(
+            # Create a cycle: 1 -> 2 -> 3 -> 1
+            [
+                {"id": 1, "priority": 1, "dependencies": [3]},
+                {"id": 2, "priority": 2, "dependencies": [1]},
+                {"id": 3, "priority": 3, "dependencies": [2]},
+            ],
+            id="cycle",
+        ),
+        pytest.param(
+            [
+                {"id": 1, "priority": 1, "dependencies": [1]},  # Self-reference
+                {"id": 2, "priority": 2, "dependencies": []},
+            ],
+            id="self-reference",
+        ),
+        pytest.param(
+            # Features 1-3 form a cycle, feature 4 depends on 1
+            [
+                {"id": 1, "priority": 1, "dependencies": [3]},
+                {"id": 2, "priority": 2, "dependencies": [1]},
+                {"id": 3, "priority": 3, "dependencies": [2]},
+                {"id": 4, "priority": 4, "dependencies": [1]},  # Outside cycle
+            ],
+            id="complex-cycle",
+        ),
+    ],
+)
+def test_compute_scheduling_scores_circular(features):
     """Test that compute_scheduling_scores handles circular dependencies without hanging."""
-    print("\nTesting compute_scheduling_scores with circular dependencies:")
-
-    # Create a cycle: 1 -> 2 -> 3 -> 1
-    features = [
-        {"id": 1, "priority": 1, "dependencies": [3]},
-        {"id": 2, "priority": 2, "dependencies": [1]},
-        {"id": 3, "priority": 3, "dependencies": [2]},
-    ]
-
-    # Use timeout to detect infinite loop
-    def compute_with_timeout():
-        return compute_scheduling_scores(features)
-
-    start = time.time()
-    try:
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(compute_with_timeout)
-            scores = future.result(timeout=5.0)  # 5 second timeout
-
-        elapsed = time.time() - start
-
-        # Should complete quickly (< 1 second for 3 features)
-        if elapsed > 1.0:
-            print(f"  FAIL: Took {elapsed:.2f}s (expected < 1s)")
-            return False
-
-        # All features should have scores (even cyclic ones)
-        if len(scores) == 3:
-            print(f"  PASS: Completed in {elapsed:.3f}s with {len(scores)} scores")
-            return True
-        else:
-            print(f"  FAIL: Expected 3 scores, got {len(scores)}")
-            return False
-
-    except FuturesTimeoutError:
-        print("  FAIL: Infinite loop detected (timed out after 5s)")
-        return False
-
-
-def test_compute_scheduling_scores_self_reference():
-    """Test scheduling scores with self-referencing dependency."""
-    print("\nTesting compute_scheduling_scores with self-reference:")
-
-    features = [
-        {"id": 1, "priority": 1, "dependencies": [1]},  # Self-reference
-        {"id": 2, "priority": 2, "dependencies": []},
-    ]
-
-    start = time.time()
-    try:
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(lambda: compute_scheduling_scores(features))
-            scores = future.result(timeout=5.0)
-
-        elapsed = time.time() - start
-
-        if elapsed > 1.0:
-            print(f"  FAIL: Took {elapsed:.2f}s (expected < 1s)")
-            return False
-
-        if len(scores) == 2:
-            print(f"  PASS: Completed in {elapsed:.3f}s with {len(scores)} scores")
-            return True
-        else:
-            print(f"  FAIL: Expected 2 scores, got {len(scores)}")
-            return False
-
-    except FuturesTimeoutError:
-        print("  FAIL: Infinite loop detected (timed out after 5s)")
-        return False
-
-
-def test_compute_scheduling_scores_complex_cycle():
-    """Test scheduling scores with complex circular dependencies."""
-    print("\nTesting compute_scheduling_scores with complex cycle:")
-
-    # Features 1-3 form a cycle, feature 4 depends on 1
-    features = [
-        {"id": 1, "priority": 1, "dependencies": [3]},
-        {"id": 2, "priority": 2, "dependencies": [1]},
-        {"id": 3, "priority": 3, "dependencies": [2]},
-        {"id": 4, "priority": 4, "dependencies": [1]},  # Outside cycle
-    ]
-
-    start = time.time()
-    try:
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(lambda: compute_scheduling_scores(features))
-            scores = future.result(timeout=5.0)
-
-        elapsed = time.time() - start
-
-        if elapsed > 1.0:
-            print(f"  FAIL: Took {elapsed:.2f}s (expected < 1s)")
-            return False
-
-        if len(scores) == 4:
-            print(f"  PASS: Completed in {elapsed:.3f}s with {len(scores)} scores")
-            return True
-        else:
-            print(f"  FAIL: Expected 4 scores, got {len(scores)}")
-            return False
+    start = time.perf_counter()
+    scores = compute_scheduling_scores(features)
+    elapsed = time.perf_counter() - start
 
-    except FuturesTimeoutError:
-        print("  FAIL: Infinite loop detected (timed out after 5s)")
-        return False
+    # Should complete quickly (< 1 second for a handful of features)
+    assert elapsed < 1.0, f"Took {elapsed:.2f}s (expected < 1s)"
+    # All features should have scores (even cyclic ones)
+    assert set(scores) == {f["id"] for f in features}
 
 
 def test_compute_scheduling_scores_diamond():
     """Test scheduling scores with diamond dependency pattern."""
-    print("\nTesting compute_scheduling_scores with diamond pattern:")
-
     #     1
     #    / \
     #   2   3
@@ -182,37 +101,53 @@ def test_compute_scheduling_scores_diamond():
     scores = compute_scheduling_scores(features)
 
     # Feature 1 should have highest score (unblocks 2, 3, and transitively 4)
-    if scores[1] > scores[2] and scores[1] > scores[3] and scores[1] > scores[4]:
-        # Feature 4 should have lowest score (leaf, unblocks nothing)
-        if scores[4] < scores[2] and scores[4] < scores[3]:
-            print("  PASS: Root has highest score, leaf has lowest")
-            return True
-        else:
-            print(f"  FAIL: Leaf should have lowest score. Scores: {scores}")
-            return False
-    else:
-        print(f"  FAIL: Root should have highest score. Scores: {scores}")
-        return False
+    assert scores[1] > max(scores[2], scores[3], scores[4]), f"Root should score highest: {scores}"
+    # Feature 4 should have lowest score (leaf, unblocks nothing)
+    assert scores[4] < min(scores[2], scores[3]), f"Leaf should score lowest: {scores}"
+
+
+@pytest.mark.parametrize(
+    "children,expected",
+    [
+        # Diamond 0 -> {1, 2} -> 3: the shared leaf is counted once
+        pytest.param([[1, 2], [3], [3], []], [3, 1, 1, 0], id="diamond"),
+        # Cycle 0 -> 1 -> 2 -> 0 feeding 3: members count each other
+        pytest.param([[1], [2], [0, 3], []], [3, 3, 3, 0], id="cycle"),
+        pytest.param([[0], []], [0, 0], id="self-loop"),
+        # Acyclic forest: subtree sizes, no SCC pass needed
+        pytest.param([[1, 2], [3], [], [], []], [3, 1, 0, 0, 0], id="forest"),
+        # Ring where every node has one parent: not a forest, falls back to SCCs
+        pytest.param([[1], [2], [0]], [2, 2, 2], id="ring"),
+        # Tree below a diamond: the tree part sums, the diamond part unions
+        pytest.param([[1, 2], [3], [3], [4, 5], [], []], [5, 3, 3, 2, 0, 0], id="diamond-over-tree"),
+    ],
+)
+def test_downstream_counts(children, expected):
+    """Test distinct downstream counts on the condensed graph."""
+    assert _downstream_counts(children) == expected
 
 
-def test_compute_scheduling_scores_empty():
-    """Test scheduling scores with empty feature list."""
-    print("\nTesting compute_scheduling_scores with empty list:")
+def test_compute_scheduling_scores_long_chain():
+    """Test scheduling scores on a chain deeper than the recursion limit."""
+    count = sys.getrecursionlimit() + 500
+    features = [
+        {"id": i, "priority": 1, "dependencies": [i - 1] if i else []}
+        for i in range(count)
+    ]
+
+    scores = compute_scheduling_scores(features)
 
-    scores = compute_scheduling_scores([])
+    assert len(scores) == count
+    assert scores[0] > scores[count // 2] > scores[count - 1]
 
-    if scores == {}:
-        print("  PASS: Returns empty dict for empty input")
-        return True
-    else:
-        print(f"  FAIL: Expected empty dict, got {scores}")
-        return False
+
+def test_compute_scheduling_scores_empty():
+    """Test scheduling scores with empty feature list."""
+    assert compute_scheduling_scores([]) == {}
 
 
 def test_would_create_circular_dependency():
     """Test cycle detection for new dependencies."""
-    print("\nTesting would_create_circular_dependency:")
-
     # Current dependencies: 2 depends on 1, 3 depends on 2
     # Dependency chain: 3 -> 2 -> 1 (arrows mean "depends on")
     features = [
@@ -221,37 +156,22 @@ def test_would_create_circular_dependency():
         {"id": 3, "priority": 3, "dependencies": [2]},
     ]
 
-    passed = True
-
     # source_id gains dependency on target_id
     # Adding "1 depends on 3" would create cycle: 1 -> 3 -> 2 -> 1
-    if would_create_circular_dependency(features, 1, 3):
-        print("  PASS: Detected cycle when adding 1 depends on 3")
-    else:
-        print("  FAIL: Should detect cycle when adding 1 depends on 3")
-        passed = False
-
+    assert would_create_circular_dependency(features, 1, 3)
     # Adding "3 depends on 1" would NOT create cycle (redundant but not circular)
-    if not would_create_circular_dependency(features, 3, 1):
-        print("  PASS: No false positive for 3 depends on 1")
-    else:
-        print("  FAIL: False positive for 3 depends on 1")
-        passed = False
-
+    assert not would_create_circular_dependency(features, 3, 1)
     # Self-reference should be detected
-    if would_create_circular_dependency(features, 1, 1):
-        print("  PASS: Detected self-reference")
-    else:
-        print("  FAIL: Should detect self-reference")
-        passed = False
+    assert would_create_circular_dependency(features, 1, 1)
 
-    return passed
+    # A prebuilt feature map gives the same answers
+    feature_map = build_feature_map(features)
+    assert would_create_circular_dependency(features, 1, 3, feature_map)
+    assert not would_create_circular_dependency(features, 3, 1, feature_map)
 
 
 def test_resolve_dependencies_with_cycle():
     """Test resolve_dependencies detects and reports cycles."""
-    print("\nTesting resolve_dependencies with cycle:")
-
     # Create a cycle: 1 -> 2 -> 3 -> 1
     features = [
         {"id": 1, "priority": 1, "dependencies": [3]},
@@ -262,75 +182,39 @@ def test_resolve_dependencies_with_cycle():
     result = resolve_dependencies(features)
 
     # Should report circular dependencies
-    if result["circular_dependencies"]:
-        print(f"  PASS: Detected cycle: {result['circular_dependencies']}")
-        return True
-    else:
-        print("  FAIL: Should report circular dependencies")
-        return False
+    assert result["circular_dependencies"]
 
 
 def test_are_dependencies_satisfied():
     """Test dependency satisfaction checking."""
-    print("\nTesting are_dependencies_satisfied:")
-
     features = [
         {"id": 1, "priority": 1, "dependencies": [], "passes": True},
         {"id": 2, "priority": 2, "dependencies": [1], "passes": False},
         {"id": 3, "priority": 3, "dependencies": [2], "passes": False},
     ]
 
-    passed = True
-
     # Feature 1 has no deps, should be satisfied
-    if are_dependencies_satisfied(features[0], features):
-        print("  PASS: Feature 1 (no deps) is satisfied")
-    else:
-        print("  FAIL: Feature 1 should be satisfied")
-        passed = False
-
+    assert are_dependencies_satisfied(features[0], features)
     # Feature 2 depends on 1 which passes, should be satisfied
-    if are_dependencies_satisfied(features[1], features):
-        print("  PASS: Feature 2 (dep on passing) is satisfied")
-    else:
-        print("  FAIL: Feature 2 should be satisfied")
-        passed = False
-
+    assert are_dependencies_satisfied(features[1], features)
     # Feature 3 depends on 2 which doesn't pass, should NOT be satisfied
-    if not are_dependencies_satisfied(features[2], features):
-        print("  PASS: Feature 3 (dep on non-passing) is not satisfied")
-    else:
-        print("  FAIL: Feature 3 should not be satisfied")
-        passed = False
-
-    return passed
+    assert not are_dependencies_satisfied(features[2], features)
 
 
 def test_get_blocking_dependencies():
     """Test getting blocking dependency IDs."""
-    print("\nTesting get_blocking_dependencies:")
-
     features = [
         {"id": 1, "priority": 1, "dependencies": [], "passes": True},
         {"id": 2, "priority": 2, "dependencies": [], "passes": False},
         {"id": 3, "priority": 3, "dependencies": [1, 2], "passes": False},
     ]
 
-    blocking = get_blocking_dependencies(features[2], features)
-
     # Only feature 2 should be blocking (1 passes)
-    if blocking == [2]:
-        print("  PASS: Correctly identified blocking dependency")
-        return True
-    else:
-        print(f"  FAIL: Expected [2], got {blocking}")
-        return False
+    assert get_blocking_dependencies(features[2], features) == [2]
 
 
 def test_get_ready_features():
     """Test getting ready features."""
-    print("\nTesting get_ready_features:")
-
     features = [
         {"id": 1, "priority": 1, "dependencies": [], "passes": True},
         {"id": 2, "priority": 2, "dependencies": [], "passes": False, "in_progress": False},
@@ -338,28 +222,15 @@ def test_get_ready_features():
         {"id": 4, "priority": 4, "dependencies": [2], "passes": False, "in_progress": False},
     ]
 
-    ready = get_ready_features(features)
+    ready_ids = [f["id"] for f in get_ready_features(features)]
 
     # Features 2 and 3 should be ready
     # Feature 1 passes, feature 4 blocked by 2
-    ready_ids = [f["id"] for f in ready]
-
-    if 2 in ready_ids and 3 in ready_ids:
-        if 1 not in ready_ids and 4 not in ready_ids:
-            print(f"  PASS: Ready features: {ready_ids}")
-            return True
-        else:
-            print(f"  FAIL: Should not include passing/blocked. Got: {ready_ids}")
-            return False
-    else:
-        print(f"  FAIL: Should include 2 and 3. Got: {ready_ids}")
-        return False
+    assert sorted(ready_ids) == [2, 3], f"Expected ready features 2 and 3, got {ready_ids}"
 
 
 def test_get_blocked_features():
     """Test getting blocked features."""
-    print("\nTesting get_blocked_features:")
-
     features = [
         {"id": 1, "priority": 1, "dependencies": [], "passes": False},
         {"id": 2, "priority": 2, "dependencies": [1], "passes": False},
@@ -368,59 +239,5 @@ def test_get_blocked_features():
     blocked = get_blocked_features(features)
 
     # Feature 2 should be blocked by 1
-    if len(blocked) == 1 and blocked[0]["id"] == 2:
-        if blocked[0]["blocked_by"] == [1]:
-            print("  PASS: Correctly identified blocked feature")
-            return True
-        else:
-            print(f"  FAIL: Wrong blocked_by: {blocked[0]['blocked_by']}")
-            return False
-    else:
-        print(f"  FAIL: Expected feature 2 blocked, got: {blocked}")
-        return False
-
-
-def run_all_tests():
-    """Run all tests and report results."""
-    print("=" * 60)
-    print("Dependency Resolver Tests")
-    print("=" * 60)
-
-    tests = [
-        test_compute_scheduling_scores_simple_chain,
-        test_compute_scheduling_scores_with_cycle,
-        test_compute_scheduling_scores_self_reference,
-        test_compute_scheduling_scores_complex_cycle,
-        test_compute_scheduling_scores_diamond,
-        test_compute_scheduling_scores_empty,
-        test_would_create_circular_dependency,
-        test_resolve_dependencies_with_cycle,
-        test_are_dependencies_satisfied,
-        test_get_blocking_dependencies,
-        test_get_ready_features,
-        test_get_blocked_features,
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            failed += 1
-
-    print("\n" + "=" * 60)
-    print(f"Results: {passed} passed, {failed} failed")
-    print("=" * 60)
-
-    return failed == 0
-
-
-if __name__ == "__main__":
-    success = run_all_tests()
-    sys.exit(0 if success else 1)
+    assert [f["id"] for f in blocked] == [2]
+    assert blocked[0]["blocked_by"] == [1]
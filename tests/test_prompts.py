@@ -0,0 +1,31 @@
+"""
+Prompt Loading Tests
+====================
+
+Tests for prompt file loading in autoforge.core.prompts.
+Run with: python -m pytest tests/test_prompts.py
+"""
+
+import os
+
+from autoforge.core.prompts import get_project_prompts_dir, load_prompt
+
+
+def test_project_prompt_edits_are_picked_up(tmp_path):
+    """Cached prompt reads are invalidated when the file changes."""
+    prompts_dir = get_project_prompts_dir(tmp_path)
+    prompts_dir.mkdir(parents=True)
+    prompt_path = prompts_dir / "coding_prompt.md"
+    prompt_path.write_text("first version")
+    assert load_prompt("coding_prompt", tmp_path) == "first version"
+    mtime_ns = prompt_path.stat().st_mtime_ns
+
+    # An edit within the same mtime tick (coarse-timestamp filesystems)
+    prompt_path.write_text("second, longer version")
+    os.utime(prompt_path, ns=(mtime_ns, mtime_ns))
+    assert load_prompt("coding_prompt", tmp_path) == "second, longer version"
+
+    # An edit that changes mtime but not size
+    prompt_path.write_text("third, longer version!")
+    os.utime(prompt_path, ns=(mtime_ns + 1_000_000, mtime_ns + 1_000_000))
+    assert load_prompt("coding_prompt", tmp_path) == "third, longer version!"
@@ -5,201 +5,246 @@ Tests the parse_retry_after(), is_rate_limit_error(), and backoff calculation
 functions from rate_limit_utils.py (shared module).
 """
 
-import unittest
+import pytest
 
 from autoforge.utils.rate_limit import (
+    _matches_rate_limit_memo,
+    _parse_retry_after_memo,
     calculate_error_backoff,
     calculate_rate_limit_backoff,
     clamp_retry_delay,
     is_rate_limit_error,
+    is_rate_limit_error_batch,
     parse_retry_after,
 )
 
+# =============================================================================
+# parse_retry_after()
+# =============================================================================
+
+
+PARSE_CASES = [
+    # 'Retry-After: 60' format
+    ("Retry-After: 60", 60),
+    ("retry-after: 120", 120),
+    ("RETRY-AFTER:45", 45),
+    ("Retry-After:  90\n", 90),
+    ("retry after: 30 seconds", 30),
+    # 'retry after 60 seconds' format
+    ("retry after 60 seconds", 60),
+    ("Please retry after 120 seconds", 120),
+    ("Retry after 30", 30),
+    # 'try again in X seconds' format
+    ("try again in 120 seconds", 120),
+    ("Please try again in 60s", 60),
+    ("Try again in 30 seconds", 30),
+    # 'X seconds remaining' format
+    ("30 seconds remaining", 30),
+    ("60 seconds left", 60),
+    ("120 seconds until reset", 120),
+    # An explicit retry-after hint outranks an earlier "seconds left" phrase
+    ("30 seconds left, retry after 60", 60),
+    ("Retry-After: 5. Try again in 10 seconds", 5),
+    # Zero is a valid delay (not None)
+    ("Retry-After: 0", 0),
+    ("retry after 0 seconds", 0),
+    # No retry-after info
+    ("no match here", None),
+    ("Connection refused", None),
+    ("Internal server error", None),
+    ("", None),
+    # Minutes/hours are not parsed (by design) - we only support seconds
+    # to avoid complexity, so units other than seconds must not match
+    ("wait 5 minutes", None),
+    ("try again in 2 minutes", None),
+    ("retry after 5 minutes", None),
+    ("retry after 1 hour", None),
+    ("Retry-After: 5 minutes", None),
+    ("try again in 30 min", None),
+]
+
+
+@pytest.mark.parametrize("message,expected", PARSE_CASES)
+def test_parse_retry_after(message, expected):
+    """parse_retry_after extracts seconds from supported formats only."""
+    assert parse_retry_after(message) == expected
+
+
+# =============================================================================
+# is_rate_limit_error()
+# =============================================================================
+
+
+RATE_LIMIT_MESSAGES = [
+    "Rate limit exceeded",
+    "rate_limit_exceeded",
+    "Too many requests",
+    "HTTP 429 Too Many Requests",
+    "API quota exceeded",
+    "Server is overloaded",
+    # 429 is detected with proper context
+    "http 429",
+    "HTTP429",
+    "status 429",
+    "error 429",
+    "429 too many requests",
+    # Detection is case-insensitive
+    "RATE LIMIT",
+    "Rate Limit",
+    "rate limit",
+    "RaTe LiMiT",
+    # Runs of whitespace between words still match (not just single spaces)
+    "Too  many\trequests",
+    "quota   exceeded",
+    "api\n\noverloaded",
+    # Actual API overload messages match
+    "API overloaded",
+    "system is overloaded",
+]
+
+NOT_RATE_LIMIT_MESSAGES = [
+    "Connection refused",
+    "Authentication failed",
+    "Invalid API key",
+    "Internal server error",
+    "Network timeout",
+    "",
+    # Version numbers
+    "Node v14.29.0",
+    "Python 3.12.429",
+    "Version 2.429 released",
+    # Issue/PR numbers
+    "See PR #429",
+    "Fixed in issue 429",
+    "Closes #429",
+    # Line numbers
+    "Error at line 429",
+    "See file.py:429",
+    # Port numbers
+    "port 4293",
+    "localhost:4290",
+    # Legitimate wait instructions (would fail if "please wait" pattern still exists)
+    "Please wait for the build to complete",
+    "Please wait while I analyze this",
+    # Retry discussion (would fail if "try again later" pattern still exists)
+    "Try again later after maintenance",
+    "The user should try again later",
+    # Limit discussion (would fail if "limit reached" pattern still exists)
+    "File size limit reached",
+    "Memory limit reached, consider optimization",
+    # Method/operator overloading
+    "I will create an overloaded constructor",
+    "The + operator is overloaded",
+    "Here is the overloaded version of the function",
+    "The method is overloaded to accept different types",
+]
+
+
+@pytest.mark.parametrize("message", RATE_LIMIT_MESSAGES)
+def test_rate_limit_detected(message):
+    """Rate limit messages are detected."""
+    assert is_rate_limit_error(message) is True
+
+
+@pytest.mark.parametrize("message", NOT_RATE_LIMIT_MESSAGES)
+def test_no_false_positive(message):
+    """Non-rate-limit messages don't trigger detection."""
+    assert is_rate_limit_error(message) is False
+
+
+def test_batch_matches_scalar():
+    """Batch detection agrees with is_rate_limit_error, in input order."""
+    messages = RATE_LIMIT_MESSAGES + NOT_RATE_LIMIT_MESSAGES
+    expected = [is_rate_limit_error(message) for message in messages]
+    assert is_rate_limit_error_batch(messages) == expected
+    assert is_rate_limit_error_batch(iter(messages)) == expected
+    assert is_rate_limit_error_batch([]) == []
+
+
+def test_long_messages_are_not_memoized():
+    """Whole session responses are classified but never held in the caches."""
+    long_response = "x" * 4096 + " rate limit exceeded, retry after 30 seconds"
+    _matches_rate_limit_memo.cache_clear()
+    _parse_retry_after_memo.cache_clear()
+
+    assert is_rate_limit_error(long_response) is True
+    assert parse_retry_after(long_response) == 30
+    assert _matches_rate_limit_memo.cache_info().currsize == 0
+    assert _parse_retry_after_memo.cache_info().currsize == 0
+
+    # Short messages still go through the caches
+    assert is_rate_limit_error("HTTP 429") is True
+    assert _matches_rate_limit_memo.cache_info().currsize == 1
+
+
+# =============================================================================
+# Backoff calculation
+# =============================================================================
+
+
+@pytest.mark.parametrize(
+    "retries,base",
+    list(enumerate([15, 30, 60, 120, 240, 480, 960, 1920, 3600, 3600])),
+)
+def test_rate_limit_backoff_sequence(retries, base):
+    """Rate limit backoff follows the exponential sequence with jitter.
+
+    Base formula: 15 * 2^retries with 0-30% jitter.
+    With jitter the result should be in [base, base * 1.3].
+    """
+    delay = calculate_rate_limit_backoff(retries)
+    # Delay must be at least the base value (jitter is non-negative)
+    assert delay >= base
+    # Delay must not exceed base + 30% jitter (int truncation means <= base * 1.3)
+    assert delay <= int(base * 1.3)
+
+
+@pytest.mark.parametrize(
+    "retries,prev_delay,floor,ceiling",
+    [
+        (1, 15, 30, 45),
+        (2, 40, 60, 120),
+        (3, 100, 120, 300),
+        (5, 1000, 480, 3000),
+        # Capped at 3600
+        (6, 2000, 960, 3600),
+        (9, 3600, 3600, 3600),
+        # A short previous delay never drops below the ladder
+        (4, 1, 240, 240),
+    ],
+)
+def test_rate_limit_backoff_decorrelated(retries, prev_delay, floor, ceiling):
+    """With a previous delay, backoff is drawn from [base, max(base, min(3 * prev, 3600))]."""
+    for _ in range(50):
+        delay = calculate_rate_limit_backoff(retries, prev_delay)
+        assert floor <= delay <= ceiling
 
-class TestParseRetryAfter(unittest.TestCase):
-    """Tests for parse_retry_after() function."""
-
-    def test_retry_after_colon_format(self):
-        """Test 'Retry-After: 60' format."""
-        assert parse_retry_after("Retry-After: 60") == 60
-        assert parse_retry_after("retry-after: 120") == 120
-        assert parse_retry_after("retry after: 30 seconds") == 30
-
-    def test_retry_after_space_format(self):
-        """Test 'retry after 60 seconds' format."""
-        assert parse_retry_after("retry after 60 seconds") == 60
-        assert parse_retry_after("Please retry after 120 seconds") == 120
-        assert parse_retry_after("Retry after 30") == 30
-
-    def test_try_again_in_format(self):
-        """Test 'try again in X seconds' format."""
-        assert parse_retry_after("try again in 120 seconds") == 120
-        assert parse_retry_after("Please try again in 60s") == 60
-        assert parse_retry_after("Try again in 30 seconds") == 30
-
-    def test_seconds_remaining_format(self):
-        """Test 'X seconds remaining' format."""
-        assert parse_retry_after("30 seconds remaining") == 30
-        assert parse_retry_after("60 seconds left") == 60
-        assert parse_retry_after("120 seconds until reset") == 120
-
-    def test_retry_after_zero(self):
-        """Test 'Retry-After: 0' returns 0 (not None)."""
-        assert parse_retry_after("Retry-After: 0") == 0
-        assert parse_retry_after("retry after 0 seconds") == 0
-
-    def test_no_match(self):
-        """Test messages that don't contain retry-after info."""
-        assert parse_retry_after("no match here") is None
-        assert parse_retry_after("Connection refused") is None
-        assert parse_retry_after("Internal server error") is None
-        assert parse_retry_after("") is None
-
-    def test_minutes_not_supported(self):
-        """Test that minutes are not parsed (by design)."""
-        # We only support seconds to avoid complexity
-        # These patterns should NOT match when followed by minute/hour units
-        assert parse_retry_after("wait 5 minutes") is None
-        assert parse_retry_after("try again in 2 minutes") is None
-        assert parse_retry_after("retry after 5 minutes") is None
-        assert parse_retry_after("retry after 1 hour") is None
-        assert parse_retry_after("try again in 30 min") is None
-
-
-class TestIsRateLimitError(unittest.TestCase):
-    """Tests for is_rate_limit_error() function."""
-
-    def test_rate_limit_patterns(self):
-        """Test various rate limit error messages."""
-        assert is_rate_limit_error("Rate limit exceeded") is True
-        assert is_rate_limit_error("rate_limit_exceeded") is True
-        assert is_rate_limit_error("Too many requests") is True
-        assert is_rate_limit_error("HTTP 429 Too Many Requests") is True
-        assert is_rate_limit_error("API quota exceeded") is True
-        assert is_rate_limit_error("Server is overloaded") is True
-
-    def test_specific_429_patterns(self):
-        """Test that 429 is detected with proper context."""
-        assert is_rate_limit_error("http 429") is True
-        assert is_rate_limit_error("HTTP429") is True
-        assert is_rate_limit_error("status 429") is True
-        assert is_rate_limit_error("error 429") is True
-        assert is_rate_limit_error("429 too many requests") is True
-
-    def test_case_insensitive(self):
-        """Test that detection is case-insensitive."""
-        assert is_rate_limit_error("RATE LIMIT") is True
-        assert is_rate_limit_error("Rate Limit") is True
-        assert is_rate_limit_error("rate limit") is True
-        assert is_rate_limit_error("RaTe LiMiT") is True
-
-    def test_non_rate_limit_errors(self):
-        """Test non-rate-limit error messages."""
-        assert is_rate_limit_error("Connection refused") is False
-        assert is_rate_limit_error("Authentication failed") is False
-        assert is_rate_limit_error("Invalid API key") is False
-        assert is_rate_limit_error("Internal server error") is False
-        assert is_rate_limit_error("Network timeout") is False
-        assert is_rate_limit_error("") is False
-
-
-class TestFalsePositives(unittest.TestCase):
-    """Verify non-rate-limit messages don't trigger detection."""
-
-    def test_version_numbers_with_429(self):
-        """Version numbers should not trigger."""
-        assert is_rate_limit_error("Node v14.29.0") is False
-        assert is_rate_limit_error("Python 3.12.429") is False
-        assert is_rate_limit_error("Version 2.429 released") is False
-
-    def test_issue_and_pr_numbers(self):
-        """Issue/PR numbers should not trigger."""
-        assert is_rate_limit_error("See PR #429") is False
-        assert is_rate_limit_error("Fixed in issue 429") is False
-        assert is_rate_limit_error("Closes #429") is False
-
-    def test_line_numbers(self):
-        """Line numbers in errors should not trigger."""
-        assert is_rate_limit_error("Error at line 429") is False
-        assert is_rate_limit_error("See file.py:429") is False
-
-    def test_port_numbers(self):
-        """Port numbers should not trigger."""
-        assert is_rate_limit_error("port 4293") is False
-        assert is_rate_limit_error("localhost:4290") is False
-
-    def test_legitimate_wait_messages(self):
-        """Legitimate wait instructions should not trigger."""
-        # These would fail if "please wait" pattern still exists
-        assert is_rate_limit_error("Please wait for the build to complete") is False
-        assert is_rate_limit_error("Please wait while I analyze this") is False
-
-    def test_retry_discussion_messages(self):
-        """Messages discussing retry logic should not trigger."""
-        # These would fail if "try again later" pattern still exists
-        assert is_rate_limit_error("Try again later after maintenance") is False
-        assert is_rate_limit_error("The user should try again later") is False
-
-    def test_limit_discussion_messages(self):
-        """Messages discussing limits should not trigger (removed pattern)."""
-        # These would fail if "limit reached" pattern still exists
-        assert is_rate_limit_error("File size limit reached") is False
-        assert is_rate_limit_error("Memory limit reached, consider optimization") is False
-
-    def test_overloaded_in_programming_context(self):
-        """Method/operator overloading discussions should not trigger."""
-        assert is_rate_limit_error("I will create an overloaded constructor") is False
-        assert is_rate_limit_error("The + operator is overloaded") is False
-        assert is_rate_limit_error("Here is the overloaded version of the function") is False
-        assert is_rate_limit_error("The method is overloaded to accept different types") is False
-        # But actual API overload messages should still match
-        assert is_rate_limit_error("Server is overloaded") is True
-        assert is_rate_limit_error("API overloaded") is True
-        assert is_rate_limit_error("system is overloaded") is True
-
-
-class TestBackoffFunctions(unittest.TestCase):
-    """Test backoff calculation functions from rate_limit_utils."""
-
-    def test_rate_limit_backoff_sequence(self):
-        """Test that rate limit backoff follows expected exponential sequence with jitter.
-
-        Base formula: 15 * 2^retries with 0-30% jitter.
-        Base values: 15, 30, 60, 120, 240, 480, 960, 1920, 3600, 3600
-        With jitter the result should be in [base, base * 1.3].
-        """
-        base_values = [15, 30, 60, 120, 240, 480, 960, 1920, 3600, 3600]
-        for retries, base in enumerate(base_values):
-            delay = calculate_rate_limit_backoff(retries)
-            # Delay must be at least the base value (jitter is non-negative)
-            assert delay >= base, f"Retry {retries}: {delay} < base {base}"
-            # Delay must not exceed base + 30% jitter (int truncation means <= base * 1.3)
-            max_with_jitter = int(base * 1.3)
-            assert delay <= max_with_jitter, f"Retry {retries}: {delay} > max {max_with_jitter}"
-
-    def test_error_backoff_sequence(self):
-        """Test that error backoff follows expected linear sequence."""
-        expected = [30, 60, 90, 120, 150, 180, 210, 240, 270, 300, 300]  # Caps at 300
-        for retries in range(1, len(expected) + 1):
-            delay = calculate_error_backoff(retries)
-            expected_delay = expected[retries - 1]
-            assert delay == expected_delay, f"Retry {retries}: expected {expected_delay}, got {delay}"
-
-    def test_clamp_retry_delay(self):
-        """Test that retry delay is clamped to valid range."""
-        # Values within range stay the same
-        assert clamp_retry_delay(60) == 60
-        assert clamp_retry_delay(1800) == 1800
-        assert clamp_retry_delay(3600) == 3600
-
-        # Values below minimum get clamped to 1
-        assert clamp_retry_delay(0) == 1
-        assert clamp_retry_delay(-10) == 1
 
-        # Values above maximum get clamped to 3600
-        assert clamp_retry_delay(7200) == 3600
-        assert clamp_retry_delay(86400) == 3600
+@pytest.mark.parametrize(
+    "retries,expected",
+    # Caps at 300
+    list(enumerate([30, 60, 90, 120, 150, 180, 210, 240, 270, 300, 300], start=1)),
+)
+def test_error_backoff_sequence(retries, expected):
+    """Error backoff follows the linear sequence."""
+    assert calculate_error_backoff(retries) == expected
 
 
-if __name__ == "__main__":
-    unittest.main()
+@pytest.mark.parametrize(
+    "delay,expected",
+    [
+        # Values within range stay the same
+        (60, 60),
+        (1800, 1800),
+        (3600, 3600),
+        # Values below minimum get clamped to 1
+        (0, 1),
+        (-10, 1),
+        # Values above maximum get clamped to 3600
+        (7200, 3600),
+        (86400, 3600),
+    ],
+)
+def test_clamp_retry_delay(delay, expected):
+    """Retry delay is clamped to the valid range."""
+    assert clamp_retry_delay(delay) == expected